@@ -0,0 +1,97 @@
+﻿import pathlib, re
+
+# Single read/parse/write replacement for the former _fix_katex_block.py,
+# _fix_katex_delimiters_force.py and _fix_katex_render_block.py scripts.
+
+_PAT = re.compile(r'onload="renderMathInElement\(document\.body,\s*\{\s*delimiters:\s*\[\s*[\s\S]*?\]\s*\}\s*\);\s*"')
+_DELIM_ANCHOR = "delimiters: ["
+_DELIM_ARRAY = (
+    "delimiters: [\n"
+    "                {left: '$$', right: '$$', display: true},\n"
+    "                {left: '$', right: '$', display: false}\n"
+    "            ]"
+)
+_RENDER_ANCHOR = "renderMathInElement(document.body"
+_RENDER_OPTIONS = (
+    "{\n"
+    "            delimiters: [\n"
+    "                {left: '$$', right: '$$', display: true},\n"
+    "                {left: '$', right: '$', display: false}\n"
+    "            ]\n"
+    "        });"
+)
+# Inserted as a literal (not a re.sub template, which would keep the backslashes of
+# escapes such as "\\$"); built from _RENDER_OPTIONS so the later stages match it
+_ONLOAD_LITERAL = 'onload="renderMathInElement(document.body, ' + _RENDER_OPTIONS + '"'
+
+
+def _find_matching_bracket(s, open_idx):
+    """Return the index of the ']' closing the '[' at open_idx, or -1."""
+    depth = 1
+    for j in range(open_idx + 1, len(s)):
+        c = s[j]
+        if c == "[":
+            depth += 1
+        elif c == "]":
+            depth -= 1
+            if depth == 0:
+                return j
+    return -1
+
+
+def fix_onload_block(txt):
+    """Repair the whole onload="renderMathInElement(...)" attribute."""
+    if not _PAT.search(txt):
+        return None
+    return _PAT.sub(lambda m: _ONLOAD_LITERAL, txt, count=1)
+
+
+def fix_delimiters_array(txt):
+    """Force-replace the delimiters: [...] array."""
+    i = txt.find(_DELIM_ANCHOR)
+    if i < 0:
+        return None
+    close = _find_matching_bracket(txt, i + len(_DELIM_ANCHOR) - 1)
+    if close < 0:
+        return None
+    return txt[:i] + _DELIM_ARRAY + txt[close+1:]
+
+
+def fix_render_block(txt):
+    """Replace the options object passed to renderMathInElement."""
+    s = txt.find(_RENDER_ANCHOR)
+    if s < 0:
+        return None
+    ob = txt.find("{", s)
+    if ob < 0:
+        return None
+    end = txt.find("});", ob)
+    if end < 0:
+        return None
+    return txt[:ob] + _RENDER_OPTIONS + txt[end+3:]
+
+
+STAGES = (
+    ("KaTeX onload block", fix_onload_block),
+    ("delimiters array", fix_delimiters_array),
+    ("renderMathInElement block", fix_render_block),
+)
+
+p = pathlib.Path("renderer/html_renderer.py")
+raw = p.read_bytes()
+txt = raw.decode("utf-8", "ignore")
+
+for name, stage in STAGES:
+    txt2 = stage(txt)
+    if txt2 is None:
+        print(f"SKIP: {name} anchor not found.")
+    elif txt2 != txt:
+        txt = txt2
+        print(f"OK: {name} repaired.")
+
+out = txt.encode("utf-8")
+if out != raw:
+    p.write_bytes(out)
+    print("Patched:", p)
+else:
+    print("No change needed.")
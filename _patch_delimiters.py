@@ -1,22 +1,85 @@
-delimiters = set(' \t\r\n,.;:!?()[]{}<>"\'“”‘’、，。；：！？（）【】《》-–—_/\\|')
-﻿import re, pathlib
+import os, re, shutil
 
 DELIM = " \t\r\n,.;:!?()[]{}<>\"'“”‘’、，。；：！？（）【】《》-–—_/\\|"
+_IMPORTS = re.compile(r"(?s)^((?:\s*(?:from|import)\s+[^\n]+\n)+)")
+_WORD = "delimiters"
+_BOM = b"\xef\xbb\xbf"
+# A shebang and/or PEP 263 encoding line must stay on the first two lines
+_HEADER = re.compile(r"#!|[ \t\f]*#.*?coding[:=]")
+
+def _is_word_char(c):
+    return c.isalnum() or c == "_"
+
+def _has_word(txt):
+    # same as re.search(r"\bdelimiters\b", txt), via str.find
+    n = len(_WORD)
+    i = txt.find(_WORD)
+    while i >= 0:
+        j = i + n
+        if (i == 0 or not _is_word_char(txt[i-1])) and (j == len(txt) or not _is_word_char(txt[j])):
+            return True
+        i = txt.find(_WORD, j)
+    return False
+
+def _has_assignment(txt):
+    # same as re.search(r"^\s*delimiters\s*=", txt, re.M), line by line
+    for line in txt.splitlines():
+        s = line.lstrip()
+        if s.startswith(_WORD) and s[len(_WORD):].lstrip().startswith("="):
+            return True
+    return False
+
 def needs_patch(txt):
-    return re.search(r"\bdelimiters\b", txt) and not re.search(r"^\s*delimiters\s*=", txt, re.M)
+    return _has_word(txt) and not _has_assignment(txt)
+
+def _is_patch_script(path):
+    # This script and the KaTeX fix scripts mention "delimiters" in their own code
+    rel = os.path.relpath(path)
+    name = os.path.basename(rel)
+    if os.path.abspath(path) == os.path.abspath(__file__):
+        return True
+    if os.path.dirname(rel) == "" and name.startswith("_fix_"):
+        return True
+    return os.path.dirname(rel) == "tools" and name.startswith("fix_")
+
+def _iter_py(root):
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                    yield entry.path
 
-def patch_one(p: pathlib.Path):
-    txt = p.read_text(encoding="utf-8", errors="ignore")
+def patch_one(path: str):
+    with open(path, "rb") as f:
+        raw = f.read()
+    if b"delimiters" not in raw: return False  # cheap literal probe before decode/regex
+    bom = raw.startswith(_BOM)
+    txt = raw.decode("utf-8-sig", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
     if not needs_patch(txt): return False
-    m = re.match(r"(?s)^((?:\s*(?:from|import)\s+[^\n]+\n)+)", txt)
-    ins = f"delimiters = set({DELIM!r})\n"
-    txt2 = (m.group(1) + ins + txt[m.end(1):]) if m else (ins + txt)
-    p.write_text(txt2, encoding="utf-8", newline="\n")
+    head_end = 0
+    for line in txt.splitlines(keepends=True)[:2]:
+        if not _HEADER.match(line): break
+        head_end += len(line)
+    head, body = txt[:head_end], txt[head_end:]
+    m = _IMPORTS.match(body)
+    ins = f"delimiters = frozenset({DELIM!r})\n"
+    txt2 = head + ((m.group(1) + ins + body[m.end(1):]) if m else (ins + body))
+    out = (_BOM if bom else b"") + txt2.encode("utf-8")
+    if out == raw: return False
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(out)
+    shutil.copymode(path, tmp)  # keep the executable bit
+    os.replace(tmp, path)  # atomic: never leave a half-patched file behind
     return True
 
-root = pathlib.Path(".")
 patched=[]
-for p in root.rglob("*.py"):
-    if patch_one(p): patched.append(str(p))
+for path in _iter_py("."):
+    if _is_patch_script(path): continue
+    if patch_one(path): patched.append(path)
 print("patched:", len(patched))
 print("\n".join(patched))
@@ -12,6 +12,8 @@ fi
 echo "=== Installing INTRA-HUB Scheduler ==="
 
 # Create systemd service file
+# Daily runs are incremental (pages edited since the last sync); sync/main.py switches to a
+# full query by itself when the last full one is older than FULL_SYNC_INTERVAL (7 days)
 cat > /etc/systemd/system/intra-hub-sync.service << 'EOF'
 [Unit]
 Description=INTRA-HUB Daily Sync
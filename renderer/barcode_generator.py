@@ -5,10 +5,15 @@ Generates Code128 barcodes for document identification
 """
 
 import io
-import base64
+import sys
+import zlib
+import binascii
+import struct
+import functools
+from html import escape
 from pathlib import Path
-from typing import Optional
-import barcode
+from typing import Dict, Optional
+from barcode.codex import Code128 as _Code128
 from barcode.writer import ImageWriter
 from PIL import Image, ImageDraw, ImageFont
 
@@ -16,9 +21,27 @@ from PIL import Image, ImageDraw, ImageFont
 class BarcodeGenerator:
     """Generate Code128 barcodes for document IDs"""
     
-    def __init__(self):
+    # High-quality writer options for crisp, professional appearance (print)
+    _PRINT_OPTIONS = {
+        'module_width': 0.35,      # Finer bars for higher detail
+        'module_height': 8.0,      # Optimal height
+        'quiet_zone': 3.5,         # Minimal margins
+        'font_size': 10,           # Clean text size
+        'text_distance': 5.0,      # Clear separation
+        'background': 'white',
+        'foreground': 'black',
+        'write_text': True,        # Include human-readable text
+        'dpi': 300,                # High DPI for crisp rendering
+    }
+    
+    # Screen-embedded barcodes only need the display's pixel density
+    _WEB_OPTIONS = {**_PRINT_OPTIONS, 'dpi': 96}
+    
+    def __init__(self, web_dpi: int = 96):
         self.output_dir = Path('/opt/intra-hub/public/static/barcodes')
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._file_cache: Dict[str, Path] = {}
+        self.web_dpi = web_dpi
     
     def generate_barcode_base64(self, doc_id: str) -> str:
         """
@@ -30,38 +53,9 @@ class BarcodeGenerator:
         Returns:
             Base64 data URI string for embedding in HTML
         """
+        # Cheap 1-bit PNG encode, memoized per process; no disk cache needed
         try:
-            # Create Code128 barcode
-            code128 = barcode.get_barcode_class('code128')
-            
-            # Generate barcode with custom options - high quality
-            barcode_instance = code128(doc_id, writer=ImageWriter())
-            
-            # High-quality writer options for crisp, professional appearance
-            writer_options = {
-                'module_width': 0.35,      # Finer bars for higher detail
-                'module_height': 8.0,      # Optimal height
-                'quiet_zone': 3.5,         # Minimal margins
-                'font_size': 10,           # Clean text size
-                'text_distance': 5.0,      # Clear separation
-                'background': 'white',
-                'foreground': 'black',
-                'write_text': True,        # Include human-readable text
-                'text': doc_id,
-                'dpi': 300,                # High DPI for crisp rendering
-            }
-            
-            # Render to bytes
-            buffer = io.BytesIO()
-            barcode_instance.write(buffer, options=writer_options)
-            buffer.seek(0)
-            
-            # Convert to base64
-            img_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-            data_uri = f"data:image/png;base64,{img_base64}"
-            
-            return data_uri
-            
+            return _render_b64(doc_id, self.web_dpi)
         except Exception as e:
             # Return placeholder on error
             return self._generate_text_placeholder(doc_id)
@@ -76,57 +70,39 @@ class BarcodeGenerator:
         Returns:
             Path to saved barcode image, or None on error
         """
+        cached = self._file_cache.get(doc_id)
+        if cached is not None and cached.exists():
+            return cached
+        
+        # Fixed writer options: an existing PNG for this doc_id is already current
+        png_file = self.output_dir / f"{doc_id}.png"
+        if png_file.exists():
+            self._file_cache[doc_id] = png_file
+            return png_file
+        
         try:
-            code128 = barcode.get_barcode_class('code128')
-            barcode_instance = code128(doc_id, writer=ImageWriter())
+            barcode_instance = _Code128(doc_id, writer=ImageWriter())
             
-            # Same high-quality options as base64 version
-            writer_options = {
-                'module_width': 0.35,
-                'module_height': 8.0,
-                'quiet_zone': 3.5,
-                'font_size': 10,
-                'text_distance': 5.0,
-                'background': 'white',
-                'foreground': 'black',
-                'write_text': True,
-                'text': doc_id,
-                'dpi': 300,
-            }
+            # Print-resolution options (the base64 version renders at web_dpi)
+            writer_options = {**self._PRINT_OPTIONS, 'text': doc_id}
             
             filename = self.output_dir / f"{doc_id}"
-            filepath = barcode_instance.save(str(filename), options=writer_options)
+            filepath = Path(barcode_instance.save(str(filename), options=writer_options))
+            self._file_cache[doc_id] = filepath
             
-            return Path(filepath)
+            return filepath
             
         except Exception as e:
             print(f"Error generating barcode for {doc_id}: {e}")
             return None
     
     def _generate_text_placeholder(self, doc_id: str) -> str:
-        """Generate a simple text-based placeholder if barcode fails"""
-        # Create simple image with text
-        img = Image.new('RGB', (300, 80), color='white')
-        draw = ImageDraw.Draw(img)
-        
-        # Draw border
-        draw.rectangle([(0, 0), (299, 79)], outline='black', width=2)
-        
-        # Draw text (centered)
-        text = f"ID: {doc_id}"
-        bbox = draw.textbbox((0, 0), text)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        position = ((300 - text_width) // 2, (80 - text_height) // 2)
-        draw.text(position, text, fill='black')
-        
-        # Convert to base64
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        img_base64 = base64.b64encode(buffer.read()).decode('utf-8')
+        """Return the static placeholder image used when barcode generation fails
         
-        return f"data:image/png;base64,{img_base64}"
+        The image no longer embeds the doc_id; it is carried by the alt text
+        of the <img> tag and the document header instead.
+        """
+        return f"data:image/png;base64,{_placeholder_b64()}"
     
     def get_barcode_html(self, doc_id: str, css_class: str = "barcode") -> str:
         """
@@ -140,29 +116,113 @@ class BarcodeGenerator:
             HTML img tag with embedded barcode
         """
         data_uri = self.generate_barcode_base64(doc_id)
+        label = escape(doc_id)
         
-        return f'''<img src="{data_uri}" alt="Barcode: {doc_id}" class="{css_class}" />'''
+        return (
+            f'''<img src="{data_uri}" alt="Barcode: {label}" class="{css_class}" />'''
+            f'''<span class="{css_class}-text">{label}</span>'''
+        )
+
+
+@functools.cache
+def _placeholder_b64() -> str:
+    """Render the bordered placeholder PNG once per process"""
+    img = Image.new('RGB', (300, 80), color='white')
+    draw = ImageDraw.Draw(img)
+    
+    # Draw border
+    draw.rectangle([(0, 0), (299, 79)], outline='black', width=2)
+    
+    # Draw text (centered)
+    text = "Barcode unavailable"
+    bbox = draw.textbbox((0, 0), text)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    position = ((300 - text_width) // 2, (80 - text_height) // 2)
+    draw.text(position, text, fill='black')
+    
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return binascii.b2a_base64(buffer.getbuffer(), newline=False).decode('ascii')
+
+
+def _mm2px(mm: float, dpi: int) -> int:
+    """Convert millimetres to whole pixels (at least 1)"""
+    return max(1, round(mm * dpi / 25.4))
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    """Build a single PNG chunk (length, tag, data, CRC)"""
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+
+def _encode_png_1bit(modules: str, options: Dict) -> bytes:
+    """
+    Encode a row of Code128 modules as a 1-bit grayscale PNG
+    
+    Every scanline of a linear barcode is identical, so the image is one
+    packed row repeated for the bar height, framed by white margin rows.
+    """
+    dpi = options['dpi']
+    module_px = _mm2px(options['module_width'], dpi)
+    quiet_px = _mm2px(options['quiet_zone'], dpi)
+    bar_px = _mm2px(options['module_height'], dpi)
+    margin_px = _mm2px(1.0, dpi)
+    
+    # Pixel value 1 = white, 0 = black
+    quiet = '1' * quiet_px
+    pixels = quiet + ''.join(('0' if m == '1' else '1') * module_px for m in modules) + quiet
+    width = len(pixels)
+    pad = -width % 8
+    bar_row = b'\x00' + int(pixels + '1' * pad, 2).to_bytes((width + pad) // 8, 'big')
+    blank_row = b'\x00' + b'\xff' * ((width + pad) // 8)
+    
+    raw = blank_row * margin_px + bar_row * bar_px + blank_row * margin_px
+    height = bar_px + 2 * margin_px
+    
+    ihdr = struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0)
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + _png_chunk(b'IHDR', ihdr)
+        + _png_chunk(b'IDAT', zlib.compress(raw, 1))
+        + _png_chunk(b'IEND', b'')
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_b64(doc_id: str, dpi: int) -> str:
+    """Render a Code128 barcode to a base64 data URI (memoized per doc_id/dpi)"""
+    # Bars only; the human-readable text is emitted as HTML by get_barcode_html
+    modules = _Code128(doc_id).build()[0]
+    png = _encode_png_1bit(modules, {**BarcodeGenerator._WEB_OPTIONS, 'dpi': dpi})
+    
+    img_base64 = binascii.b2a_base64(png, newline=False).decode('ascii')
+    return f"data:image/png;base64,{img_base64}"
 
 
 if __name__ == '__main__':
     # Test barcode generation
     generator = BarcodeGenerator()
+    lines = []
     
     # Test with sample doc IDs
     for i in range(1, 4):
         doc_id = f"DOC-{i:04d}"
-        print(f"Generating barcode for {doc_id}...")
+        lines.append(f"Generating barcode for {doc_id}...")
         
         # Generate as file
         filepath = generator.generate_barcode_file(doc_id)
         if filepath:
-            print(f"  Saved to: {filepath}")
+            lines.append(f"  Saved to: {filepath}")
         
         # Generate as base64
         data_uri = generator.generate_barcode_base64(doc_id)
-        print(f"  Base64 length: {len(data_uri)} chars")
+        lines.append(f"  Base64 length: {len(data_uri)} chars")
         
         # Generate HTML
         html = generator.get_barcode_html(doc_id)
-        print(f"  HTML length: {len(html)} chars")
-        print()
+        lines.append(f"  HTML length: {len(html)} chars")
+        lines.append("")
+    
+    # Emit everything in a single write
+    sys.stdout.write("\n".join(lines) + "\n")
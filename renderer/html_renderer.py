@@ -5,204 +5,50 @@ INTRA-HUB v1.0 - HTML Renderer Main Module
 Orchestrates document rendering, homepage, and search index generation
 """
 
+import os
+import re
+import sys
+import atexit
 import json
+import gzip
+import hashlib
+import functools
 import logging
+import multiprocessing
+import weakref
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from itertools import groupby, islice
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from renderer.barcode_generator import BarcodeGenerator
 from renderer.block_renderer import NotionBlockRenderer
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to stdlib json
+    orjson = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Returned for documents without recorded metrics; treat as read-only
+_ZERO = {"views": 0, "downloads": 0, "shares": 0}
 
-class MetricsManager:
-    """Manages document metrics (views, downloads, shares)"""
-
-    def __init__(self):
-        self.metrics_file = Path("/opt/intra-hub/data/metrics/metrics.json")
-        self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
-        self.metrics = self._load_metrics()
-
-    def _load_metrics(self) -> Dict[str, Dict[str, int]]:
-        """Load metrics from file"""
-        if self.metrics_file.exists():
-            with open(self.metrics_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {}
-
-    def _save_metrics(self):
-        """Save metrics to file"""
-        with open(self.metrics_file, "w", encoding="utf-8") as f:
-            json.dump(self.metrics, f, indent=2, ensure_ascii=False)
-
-    def get_metrics(self, doc_id: str) -> Dict[str, int]:
-        """Get metrics for a document"""
-        if doc_id not in self.metrics:
-            self.metrics[doc_id] = {"views": 0, "downloads": 0, "shares": 0}
-            self._save_metrics()
-        return self.metrics[doc_id]
-
-    def increment(self, doc_id: str, metric_type: str):
-        """Increment a metric"""
-        metrics = self.get_metrics(doc_id)
-        metrics[metric_type] = metrics.get(metric_type, 0) + 1
-        self._save_metrics()
-
-
-class HTMLRenderer:
-    """Main HTML rendering engine"""
-
-    def __init__(self):
-        self.cache_dir = Path("/opt/intra-hub/data/cache")
-        self.public_dir = Path("/opt/intra-hub/public")
-        self.docs_dir = self.public_dir / "documents"
-        self.static_dir = self.public_dir / "static"
-
-        self.docs_dir.mkdir(parents=True, exist_ok=True)
-        self.static_dir.mkdir(parents=True, exist_ok=True)
-
-        self.barcode_gen = BarcodeGenerator()
-        self.block_renderer = NotionBlockRenderer()
-        self.metrics = MetricsManager()
-
-    def render_all_documents(self):
-        """Render all published documents to HTML"""
-        logger.info("Rendering all published documents...")
-
-        published_file = self.cache_dir / "published_documents.json"
-        if not published_file.exists():
-            logger.warning("No published documents found")
-            return
-
-        with open(published_file, "r", encoding="utf-8") as f:
-            published_docs = json.load(f)
-
-        success_count = 0
-        error_count = 0
-
-        for doc_meta in published_docs:
-            doc_id = doc_meta["doc_id"]
-            try:
-                self.render_document(doc_id)
-                success_count += 1
-            except Exception as e:
-                logger.error(f"Failed to render {doc_id}: {e}")
-                error_count += 1
-
-        logger.info(f"Rendering complete: {success_count} success, {error_count} errors")
-
-    def render_document(self, doc_id: str):
-        """Render a single document to HTML"""
-        cache_file = self.cache_dir / f"{doc_id}.json"
-        if not cache_file.exists():
-            raise FileNotFoundError(f"Cache file not found for {doc_id}")
-
-        with open(cache_file, "r", encoding="utf-8") as f:
-            content = json.load(f)
-
-        title = content["title"]
-        properties = content.get("properties", {})
-        blocks = content.get("blocks", [])
-
-        barcode_html = self.barcode_gen.get_barcode_html(doc_id)
-        content_html = self._render_blocks_to_html(blocks)
-        metrics = self.metrics.get_metrics(doc_id)
-        property_html = self._build_property_table(properties)
-
-        html = self._build_document_page(
-            doc_id=doc_id,
-            title=title,
-            barcode_html=barcode_html,
-            property_html=property_html,
-            content_html=content_html,
-            metrics=metrics,
-        )
-
-        output_file = self.docs_dir / f"{doc_id}.html"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html)
-
-        logger.info(f"Rendered: {doc_id} -> {output_file}")
-
-    def _render_blocks_to_html(self, blocks: List[Dict]) -> str:
-        """Render list of blocks to HTML"""
-        html_parts: List[str] = []
-
-        current_list_type = None
-        current_list_items: List[str] = []
-
-        for block in blocks:
-            block_type = block.get("type")
-
-            if block_type in ["bulleted_list_item", "numbered_list_item"]:
-                list_tag = "ul" if block_type == "bulleted_list_item" else "ol"
+# Page templates are written with @@NAME@@ tokens so KaTeX/JS braces stay literal in
+# the source. Each is compiled once at import into a str.format string (literal braces
+# doubled, tokens turned into {NAME}) and filled with a single C-level format_map pass.
+_TOKEN_RE = re.compile(r"@@([A-Z_]+)@@")
 
-                if current_list_type != list_tag:
-                    if current_list_type and current_list_items:
-                        html_parts.append(
-                            f"<{current_list_type}>{''.join(current_list_items)}</{current_list_type}>"
-                        )
-                        current_list_items = []
-                    current_list_type = list_tag
 
-                item_html = self.block_renderer.render_block(block)
-                current_list_items.append(item_html)
-            else:
-                if current_list_type and current_list_items:
-                    html_parts.append(
-                        f"<{current_list_type}>{''.join(current_list_items)}</{current_list_type}>"
-                    )
-                    current_list_items = []
-                    current_list_type = None
-
-                html_parts.append(self.block_renderer.render_block(block))
-
-        if current_list_type and current_list_items:
-            html_parts.append(
-                f"<{current_list_type}>{''.join(current_list_items)}</{current_list_type}>"
-            )
-
-        return "\n".join(html_parts)
-
-    def _build_property_table(self, properties: Dict[str, Any]) -> str:
-        """Build HTML table for document properties"""
-        if not properties:
-            return ""
-
-        rows: List[str] = []
-        for key, value in properties.items():
-            if value is not None and value != "":
-                rows.append(f"<tr><th>{key}</th><td>{value}</td></tr>")
-
-        if not rows:
-            return ""
-
-        return (
-            '<div class="document-properties">\n'
-            "<h3>Document Properties</h3>\n"
-            '<table class="properties-table">\n'
-            f'{"".join(rows)}\n'
-            "</table>\n"
-            "</div>"
-        )
-
-    def _build_document_page(
-        self,
-        doc_id: str,
-        title: str,
-        barcode_html: str,
-        property_html: str,
-        content_html: str,
-        metrics: Dict[str, int],
-    ) -> str:
-        """Build complete HTML document page (NO f-string; prevents KaTeX brace issues)"""
+def _compile_template(template: str) -> str:
+    """Convert an @@NAME@@ template into an equivalent format_map string"""
+    return _TOKEN_RE.sub(r"{\1}", template.replace("{", "{{").replace("}", "}}"))
 
-        css = self._get_document_css()
 
-        html_template = """<!DOCTYPE html>
+_DOCUMENT_TEMPLATE = """<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -304,23 +150,128 @@ class HTMLRenderer:
 </html>
 """
 
-        html = (
-            html_template.replace("@@TITLE@@", str(title))
-            .replace("@@CSS@@", str(css))
-            .replace("@@DOC_ID@@", str(doc_id))
-            .replace("@@BARCODE_HTML@@", str(barcode_html))
-            .replace("@@PROPERTY_HTML@@", str(property_html))
-            .replace("@@CONTENT_HTML@@", str(content_html))
-            .replace("@@VIEWS@@", str(metrics.get("views", 0)))
-            .replace("@@DOWNLOADS@@", str(metrics.get("downloads", 0)))
-            .replace("@@SHARES@@", str(metrics.get("shares", 0)))
-            .replace("@@TIMESTAMP@@", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        )
-        return html
+_DOCUMENT_TEMPLATE_FMT = _compile_template(_DOCUMENT_TEMPLATE)
 
-    def _get_document_css(self) -> str:
-        """Return CSS for document pages - Enhanced mobile-responsive design"""
-        return """
+# 使用普通字符串模板，避免 f-string 与 JavaScript {} 冲突
+_HOMEPAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>INTRA-HUB - Internal Documentation</title>
+    <style>@@CSS@@</style>
+</head>
+<body>
+    <div class="header">
+        <h1>INTRA-HUB</h1>
+        <p class="subtitle">Internal Documentation Portal</p>
+    </div>
+
+    <div class="search-container">
+        <input type="text" 
+               id="searchInput" 
+               class="search-input" 
+               placeholder="Search by title, ID, category, author..."
+               autocomplete="off">
+        <span class="search-icon">🔍</span>
+        <span id="searchResults" class="search-results"></span>
+    </div>
+    
+    <div class="container">
+        <div class="stats">
+            <div class="stat-item">
+                <div class="stat-number">@@DOC_COUNT@@</div>
+                <div class="stat-label">Documents on this page</div>
+            </div>
+        </div>
+
+        <div class="table-container">
+            <table class="doc-table">
+                <thead>
+                    <tr>
+                        <th>Document ID</th>
+                        <th>Title</th>
+                        <th>Category</th>
+                        <th>Author</th>
+                        <th>Version</th>
+                        <th>Tags</th>
+                        <th>Views</th>
+                        <th>Downloads</th>
+                        <th>Shares</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    @@TABLE_HTML@@
+                </tbody>
+            </table>
+        </div>
+
+        @@PAGINATION_HTML@@
+
+        <div class="footer">
+            <p>Last updated: @@TIMESTAMP@@</p>
+            <p class="notice">Internal Use Only - VPN Access Required</p>
+        </div>
+    </div>
+
+    <script>
+    // 实时搜索功能
+    (function() {
+        const searchInput = document.getElementById('searchInput');
+        const searchResults = document.getElementById('searchResults');
+        const tableRows = document.querySelectorAll('.doc-table tbody tr');
+        
+        if (!searchInput || tableRows.length === 0) return;
+        
+        searchInput.addEventListener('input', function() {
+            const query = this.value.trim().toLowerCase();
+            let visibleCount = 0;
+            
+            tableRows.forEach(row => {
+                const text = row.textContent.toLowerCase();
+                
+                if (query === '' || text.includes(query)) {
+                    row.classList.remove('hidden');
+                    row.classList.add('match');
+                    visibleCount++;
+                } else {
+                    row.classList.add('hidden');
+                    row.classList.remove('match');
+                }
+            });
+            
+            // 更新搜索结果提示
+            if (query === '') {
+                searchResults.textContent = '';
+            } else {
+                searchResults.textContent = `${visibleCount} results found`;
+            }
+            
+            // 如果没有匹配，移除高亮
+            if (query === '') {
+                tableRows.forEach(row => row.classList.remove('match'));
+            }
+        });
+        
+        // 清除按钮（可选）
+        searchInput.addEventListener('keydown', function(e) {
+            if (e.key === 'Escape') {
+                this.value = '';
+                this.dispatchEvent(new Event('input'));
+                this.blur();
+            }
+        });
+    })();
+    </script>
+</body>
+</html>
+"""
+
+_HOMEPAGE_TEMPLATE_FMT = _compile_template(_HOMEPAGE_TEMPLATE)
+
+
+# Page stylesheets, built once at import and shared by every rendered page
+_DOCUMENT_CSS = """
 * {
     margin: 0;
     padding: 0;
@@ -480,6 +431,17 @@ body {
     width: 100%;
     height: auto;
     display: block;
+    image-rendering: pixelated;
+}
+
+.barcode-text {
+    display: block;
+    max-width: 280px;
+    margin-top: 4px;
+    text-align: center;
+    font-size: 0.8em;
+    letter-spacing: 0.15em;
+    font-family: "SF Mono", Monaco, Consolas, "Courier New", monospace;
 }
 
 /* 指标栏 */
@@ -850,7 +812,8 @@ body {
         width: 100%;
     }
     
-    .barcode {
+    .barcode,
+    .barcode-text {
         margin: 0 auto;
         max-width: 240px;
     }
@@ -971,245 +934,25 @@ body {
     }
 }
 """
-    def generate_homepage(self):
-        """Generate homepage with paginated document list"""
-        logger.info("Generating homepage...")
-
-        published_file = self.cache_dir / "published_documents.json"
-        if not published_file.exists():
-            logger.warning("No published documents for homepage")
-            self._create_empty_homepage()
-            return
 
-        with open(published_file, "r", encoding="utf-8") as f:
-            docs = json.load(f)
+_HOMEPAGE_CSS = """
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
 
-        docs.sort(key=lambda x: x["doc_id"], reverse=True)
 
-        items_per_page = 10
-        total_pages = (len(docs) + items_per_page - 1) // items_per_page
-
-        for page_num in range(1, total_pages + 1):
-            start_idx = (page_num - 1) * items_per_page
-            end_idx = start_idx + items_per_page
-            page_docs = docs[start_idx:end_idx]
-
-            html = self._build_homepage_html(page_docs, page_num, total_pages)
-
-            if page_num == 1:
-                output_file = self.public_dir / "index.html"
-            else:
-                output_file = self.public_dir / f"page-{page_num}.html"
-
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(html)
-
-            logger.info(f"Generated homepage page {page_num}/{total_pages}")
-
-    def _create_empty_homepage(self):
-        """Create empty homepage when no documents published"""
-        html = self._build_homepage_html([], 1, 1)
-        with open(self.public_dir / "index.html", "w", encoding="utf-8") as f:
-            f.write(html)
-
-    def _build_homepage_html(self, docs: List[Dict], page_num: int, total_pages: int) -> str:
-        """Build homepage HTML"""
-        rows = []
-        for doc in docs:
-            metrics = self.metrics.get_metrics(doc["doc_id"])
-            props = doc.get("properties", {})
-
-            category = props.get("CATEGORY", "-")
-            author = props.get("AUTHOR", "-")
-            version = props.get("VERSION", "-")
-            tags = props.get("TAGS", "-")
-
-            row = f"""<tr>
-    <td class="doc-id"><a href="/documents/{doc['doc_id']}.html">{doc['doc_id']}</a></td>
-    <td class="doc-title"><a href="/documents/{doc['doc_id']}.html">{doc['title']}</a></td>
-    <td>{category}</td>
-    <td>{author}</td>
-    <td>{version}</td>
-    <td>{tags}</td>
-    <td>{metrics['views']}</td>
-    <td>{metrics['downloads']}</td>
-    <td>{metrics['shares']}</td>
-</tr>"""
-            rows.append(row)
-
-        table_html = "\n".join(rows) if rows else '<tr><td colspan="9" class="empty-state">No documents published</td></tr>'
-        pagination_html = self._build_pagination(page_num, total_pages)
-        css = self._get_homepage_css()
-
-        # 使用普通字符串模板，避免 f-string 与 JavaScript {} 冲突
-        html_template = """<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>INTRA-HUB - Internal Documentation</title>
-    <style>@@CSS@@</style>
-</head>
-<body>
-    <div class="header">
-        <h1>INTRA-HUB</h1>
-        <p class="subtitle">Internal Documentation Portal</p>
-    </div>
-
-    <div class="search-container">
-        <input type="text" 
-               id="searchInput" 
-               class="search-input" 
-               placeholder="Search by title, ID, category, author..."
-               autocomplete="off">
-        <span class="search-icon">🔍</span>
-        <span id="searchResults" class="search-results"></span>
-    </div>
-    
-    <div class="container">
-        <div class="stats">
-            <div class="stat-item">
-                <div class="stat-number">@@DOC_COUNT@@</div>
-                <div class="stat-label">Documents on this page</div>
-            </div>
-        </div>
-
-        <div class="table-container">
-            <table class="doc-table">
-                <thead>
-                    <tr>
-                        <th>Document ID</th>
-                        <th>Title</th>
-                        <th>Category</th>
-                        <th>Author</th>
-                        <th>Version</th>
-                        <th>Tags</th>
-                        <th>Views</th>
-                        <th>Downloads</th>
-                        <th>Shares</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    @@TABLE_HTML@@
-                </tbody>
-            </table>
-        </div>
-
-        @@PAGINATION_HTML@@
-
-        <div class="footer">
-            <p>Last updated: @@TIMESTAMP@@</p>
-            <p class="notice">Internal Use Only - VPN Access Required</p>
-        </div>
-    </div>
-
-    <script>
-    // 实时搜索功能
-    (function() {
-        const searchInput = document.getElementById('searchInput');
-        const searchResults = document.getElementById('searchResults');
-        const tableRows = document.querySelectorAll('.doc-table tbody tr');
-        
-        if (!searchInput || tableRows.length === 0) return;
-        
-        searchInput.addEventListener('input', function() {
-            const query = this.value.trim().toLowerCase();
-            let visibleCount = 0;
-            
-            tableRows.forEach(row => {
-                const text = row.textContent.toLowerCase();
-                
-                if (query === '' || text.includes(query)) {
-                    row.classList.remove('hidden');
-                    row.classList.add('match');
-                    visibleCount++;
-                } else {
-                    row.classList.add('hidden');
-                    row.classList.remove('match');
-                }
-            });
-            
-            // 更新搜索结果提示
-            if (query === '') {
-                searchResults.textContent = '';
-            } else {
-                searchResults.textContent = `${visibleCount} results found`;
-            }
-            
-            // 如果没有匹配，移除高亮
-            if (query === '') {
-                tableRows.forEach(row => row.classList.remove('match'));
-            }
-        });
-        
-        // 清除按钮（可选）
-        searchInput.addEventListener('keydown', function(e) {
-            if (e.key === 'Escape') {
-                this.value = '';
-                this.dispatchEvent(new Event('input'));
-                this.blur();
-            }
-        });
-    })();
-    </script>
-</body>
-</html>
-"""
-
-        # 替换占位符
-        html = html_template.replace("@@CSS@@", css)
-        html = html.replace("@@DOC_COUNT@@", str(len(docs)))
-        html = html.replace("@@TABLE_HTML@@", table_html)
-        html = html.replace("@@PAGINATION_HTML@@", pagination_html)
-        html = html.replace("@@TIMESTAMP@@", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        
-        return html
-
-
-    def _build_pagination(self, current_page: int, total_pages: int) -> str:
-        """Build pagination links"""
-        if total_pages <= 1:
-            return ""
-
-        links: List[str] = []
-
-        if current_page > 1:
-            prev_url = "index.html" if current_page == 2 else f"page-{current_page - 1}.html"
-            links.append(f'<a href="/{prev_url}" class="page-link">&larr; Previous</a>')
-
-        for i in range(1, total_pages + 1):
-            url = "index.html" if i == 1 else f"page-{i}.html"
-            if i == current_page:
-                links.append(f'<span class="page-link active">{i}</span>')
-            else:
-                links.append(f'<a href="/{url}" class="page-link">{i}</a>')
-
-        if current_page < total_pages:
-            next_url = f"page-{current_page + 1}.html"
-            links.append(f'<a href="/{next_url}" class="page-link">Next &rarr;</a>')
-
-        return f'<div class="pagination">{" ".join(links)}</div>'
-
-    def _get_homepage_css(self) -> str:
-        """Return CSS for homepage - Light theme with mobile support"""
-        return """
-* {
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-}
-
-
-/* 搜索容器 */
-.search-container {
-    max-width: 1400px;
-    margin: 0 auto 15px;
-    background: white;
-    padding: 20px 30px;
-    border-radius: 12px 12px 0 0;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.06);
-    position: relative;
-}
+/* 搜索容器 */
+.search-container {
+    max-width: 1400px;
+    margin: 0 auto 15px;
+    background: white;
+    padding: 20px 30px;
+    border-radius: 12px 12px 0 0;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.06);
+    position: relative;
+}
 
 .search-input {
     width: 100%;
@@ -1636,16 +1379,724 @@ body {
     }
 }
 """
-    def generate_search_index(self):
-        """Generate search index JSON for client-side search"""
-        logger.info("Generating search index...")
 
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON from raw file bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _read_json(path: Any) -> Any:
+    """Load a JSON file with one whole-file read and a single decode"""
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes (machine-read files, no pretty-printing)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode("ascii")
+
+
+# Single-pass HTML escaping (html.escape does one str.replace per character)
+_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#39;",
+})
+
+
+def _esc(value: Any) -> str:
+    """Escape a value for HTML text or attribute context"""
+    return str(value).translate(_ESCAPE_TABLE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _property_table_html(items: Tuple[Tuple[str, type, Any], ...]) -> str:
+    """Build the document properties table (memoized on the ordered items)
+
+    items are (key, type(value), value) triples: 1, 1.0 and True compare and hash
+    equal, so the type keeps them from sharing one cached table.
+    """
+    rows = [
+        f"<tr><th>{_esc(key)}</th><td>{_esc(value)}</td></tr>"
+        for key, _, value in items
+        if value is not None and value != ""
+    ]
+
+    if not rows:
+        return ""
+
+    return (
+        '<div class="document-properties">\n'
+        "<h3>Document Properties</h3>\n"
+        '<table class="properties-table">\n'
+        f'{"".join(rows)}\n'
+        "</table>\n"
+        "</div>"
+    )
+
+
+# Counters almost always fall in this range; look their strings up instead of formatting
+_INT_STR_LIMIT = 10_000
+_INT_STR = [str(i) for i in range(_INT_STR_LIMIT)]
+
+
+def _itos(n: Any) -> str:
+    """str() for metric counters, served from a precomputed table when small"""
+    if type(n) is int and 0 <= n < _INT_STR_LIMIT:
+        return _INT_STR[n]
+    return str(n)
+
+
+_ROW_PROPS = ("CATEGORY", "AUTHOR", "VERSION", "TAGS")
+_ROW_PROP_DEFAULTS = dict.fromkeys(_ROW_PROPS, "-")
+_get_row_props = itemgetter(*_ROW_PROPS)
+_get_row_metrics = itemgetter("views", "downloads", "shares")
+
+
+_HOMEPAGE_ROW_TEMPLATE = """<tr>
+    <td class="doc-id"><a href="/documents/{doc_id}.html">{doc_id}</a></td>
+    <td class="doc-title"><a href="/documents/{doc_id}.html">{title}</a></td>
+    <td>{category}</td>
+    <td>{author}</td>
+    <td>{version}</td>
+    <td>{tags}</td>
+    <td>{views}</td>
+    <td>{downloads}</td>
+    <td>{shares}</td>
+</tr>"""
+
+
+def _homepage_row(doc: Dict[str, Any], metrics: Dict[str, int]) -> str:
+    """Build one homepage table row"""
+    category, author, version, tags = map(
+        _esc, _get_row_props({**_ROW_PROP_DEFAULTS, **doc.get("properties", {})})
+    )
+    views, downloads, shares = map(_itos, _get_row_metrics(metrics))
+    return _HOMEPAGE_ROW_TEMPLATE.format_map({
+        "doc_id": _esc(doc["doc_id"]),
+        "title": _esc(doc["title"]),
+        "category": category,
+        "author": author,
+        "version": version,
+        "tags": tags,
+        "views": views,
+        "downloads": downloads,
+        "shares": shares,
+    })
+
+
+_BLOCK_CACHE_SIZE = 4096
+
+
+def _block_key(block: Dict[str, Any]) -> bytes:
+    """Canonical key over the fields render_block reads (ignores ids and timestamps)"""
+    block_type = block.get("type")
+    payload = [block_type, block.get(block_type), block.get("children")]
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, sort_keys=True).encode("utf-8")
+
+
+def _write_bytes(path: Any, data: bytes, dir_fd: Optional[int] = None, fsync: bool = False):
+    """Write pre-encoded data unbuffered: one open and normally a single write()
+
+    fsync=True flushes the contents to disk before returning (for tmp files that are
+    about to be renamed over state that must survive a crash).
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_if_changed(path: Path, data: bytes, volatile: Optional[bytes] = None) -> bool:
+    """Write data to path unless the file already holds exactly these bytes
+
+    volatile (e.g. a footer timestamp that differs on every run) is left out of the
+    comparison: a file that only differs in that span is kept as is. A changed file is
+    written to a tmp file and renamed over path, so readers never see a partial page.
+    """
+    try:
+        if path.stat().st_size == len(data):
+            old = path.read_bytes()
+            if old == data:
+                return False
+            start = data.find(volatile) if volatile else -1
+            if start >= 0:
+                end = start + len(volatile)
+                if old[:start] == data[:start] and old[end:] == data[end:]:
+                    return False
+    except FileNotFoundError:
+        pass
+    tmp = path.with_name(path.name + ".tmp")
+    _write_bytes(tmp, data)
+    os.replace(tmp, path)
+    return True
+
+
+def _fsync_dir(path: Path, dirfd: Optional[int] = None):
+    """fsync a directory once to persist the entries of a batch of writes
+
+    Only the directory entries (creates, renames) are made durable; file contents need
+    their own fsync (see _write_bytes(fsync=True)).
+    """
+    try:
+        fd = dirfd if dirfd is not None else os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except (OSError, AttributeError):
+        return  # no directory fds on this platform
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # some filesystems reject fsync on directories
+    finally:
+        if fd != dirfd:
+            os.close(fd)
+
+
+def _timestamp() -> str:
+    """Current time formatted for page footers"""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+# Bump to force a full re-render after changes not visible in the hashed sources below
+RENDERER_VERSION = 1
+
+
+def _renderer_version_hash() -> str:
+    """Hash of everything that shapes page bytes besides the cache content and metrics
+
+    Covers this module (templates, CSS, page building), the block and barcode renderers
+    and the renderer config, so editing any of them invalidates every manifest entry.
+    """
+    h = hashlib.blake2b(str(RENDERER_VERSION).encode("ascii"), digest_size=16)
+    for module_file in (
+        __file__,
+        sys.modules[NotionBlockRenderer.__module__].__file__,
+        sys.modules[BarcodeGenerator.__module__].__file__,
+        Path(__file__).with_name("config.py"),
+    ):
+        try:
+            h.update(Path(module_file).read_bytes())
+        except OSError:
+            # Unreadable source (e.g. bytecode-only install): fall back to the version constant
+            pass
+    return h.hexdigest()
+
+
+_TEMPLATE_HASH = _renderer_version_hash()
+
+
+def _fill_template(template_fmt: str, subs: Dict[str, str]) -> str:
+    """Fill a compiled template, substituting every token in one pass"""
+    return template_fmt.format_map(subs)
+
+
+class MetricsManager:
+    """Manages document metrics (views, downloads, shares)"""
+
+    def __init__(self):
+        self.metrics_file = Path("/opt/intra-hub/data/metrics/metrics.json")
+        self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+        self.metrics = self._load_metrics()
+        self._dirty = False
+        # Increments stay in memory; persist whatever is left when the process exits
+        atexit.register(self.flush)
+
+    def _load_metrics(self) -> Dict[str, Dict[str, int]]:
+        """Load metrics from file"""
+        if self.metrics_file.exists():
+            return _read_json(self.metrics_file)
+        return {}
+
+    def _save_metrics(self):
+        """Save metrics to file atomically and durably (fsynced temp file, then os.replace)"""
+        tmp_file = self.metrics_file.with_suffix(".json.tmp")
+        _write_bytes(tmp_file, _json_dumps(self.metrics), fsync=True)
+        os.replace(tmp_file, self.metrics_file)
+        _fsync_dir(self.metrics_file.parent)
+
+    def flush(self):
+        """Write metrics to disk if they changed since the last flush"""
+        if self._dirty:
+            self._save_metrics()
+            self._dirty = False
+
+    def get_metrics(self, doc_id: str) -> Dict[str, int]:
+        """Get metrics for a document (zeros if none recorded yet)"""
+        return self.metrics.get(doc_id, _ZERO)
+
+    def increment(self, doc_id: str, metric_type: str):
+        """Increment a metric (in memory; call flush() to persist)"""
+        metrics = self.metrics.get(doc_id)
+        if metrics is None:
+            metrics = self.metrics[doc_id] = dict(_ZERO)
+        metrics[metric_type] = metrics.get(metric_type, 0) + 1
+        self._dirty = True
+
+
+class HTMLRenderer:
+    """Main HTML rendering engine"""
+
+    _UL_OPEN, _UL_CLOSE = "<ul>", "</ul>"
+    _OL_OPEN, _OL_CLOSE = "<ol>", "</ol>"
+    # List block type -> (open, close) tag pair; identity-compared while grouping runs
+    _LIST_TAGS = {
+        "bulleted_list_item": (_UL_OPEN, _UL_CLOSE),
+        "numbered_list_item": (_OL_OPEN, _OL_CLOSE),
+    }
+
+    def __init__(self, load_metrics: bool = True):
+        """load_metrics=False skips metrics.json (pool workers get metrics per document)"""
+        self.cache_dir = Path("/opt/intra-hub/data/cache")
+        self.public_dir = Path("/opt/intra-hub/public")
+        self.docs_dir = self.public_dir / "documents"
+        self.manifest_file = self.public_dir / ".render_manifest.json"
+        self.static_dir = self.public_dir / "static"
+        # Plain-string forms for per-document paths (os.path.join, no PosixPath per call)
+        self._cache_dir_s = os.fspath(self.cache_dir)
+        self._docs_dir_s = os.fspath(self.docs_dir)
+
+        self.docs_dir.mkdir(parents=True, exist_ok=True)
+        self.static_dir.mkdir(parents=True, exist_ok=True)
+
+        # Keep the documents directory open so page writes are openat()-relative
+        # instead of resolving the full path for every document
+        self._docs_dirfd: Optional[int] = None
+        if os.open in os.supports_dir_fd:
+            self._docs_dirfd = os.open(self.docs_dir, os.O_RDONLY | os.O_DIRECTORY)
+            weakref.finalize(self, os.close, self._docs_dirfd)
+
+        self.barcode_gen = BarcodeGenerator()
+        self.block_renderer = NotionBlockRenderer()
+        self.metrics: Optional[MetricsManager] = MetricsManager() if load_metrics else None
+
+        # Page CSS is fixed; resolve it once rather than on every page build
+        self._doc_css = self._get_document_css()
+        self._home_css = self._get_homepage_css()
+
+        # Barcode HTML is a pure function of doc_id
+        self._barcode_html = functools.lru_cache(maxsize=4096)(self.barcode_gen.get_barcode_html)
+        # Rendered block HTML keyed by _block_key(); repeated blocks render once
+        self._block_html: Dict[bytes, str] = {}
+
+    def clear_render_caches(self):
+        """Drop memoized barcode, block and property-table HTML"""
+        self._barcode_html.cache_clear()
+        self._block_html.clear()
+        _property_table_html.cache_clear()
+
+    def _render_block_cached(self, block: Dict) -> str:
+        """render_block, memoized on the block's rendered content"""
+        key = _block_key(block)
+        html = self._block_html.get(key)
+        if html is None:
+            html = self.block_renderer.render_block(block)
+            if len(self._block_html) >= _BLOCK_CACHE_SIZE:
+                self._block_html.clear()
+            self._block_html[key] = html
+        return html
+
+    @functools.cached_property
+    def published_docs(self) -> Optional[List[Dict[str, Any]]]:
+        """published_documents.json, parsed once per renderer (None if missing)"""
         published_file = self.cache_dir / "published_documents.json"
         if not published_file.exists():
+            return None
+        return _read_json(published_file)
+
+    def refresh_published(self):
+        """Drop the cached published documents so the next access re-reads them"""
+        self.__dict__.pop("published_docs", None)
+
+    def render_all_documents(self, force: bool = False):
+        """Render all published documents to HTML (force: ignore the manifest, render all)"""
+        logger.info("Rendering all published documents...")
+
+        published_docs = self.published_docs
+        if published_docs is None:
+            logger.warning("No published documents found")
             return
 
-        with open(published_file, "r", encoding="utf-8") as f:
-            docs = json.load(f)
+        success_count = 0
+        error_count = 0
+        timestamp = _timestamp()
+
+        # Skip documents whose cache content, metrics and page template are unchanged
+        previous = {} if force else self._load_manifest()
+        manifest: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        # Cache bytes already read for hashing, handed on to rendering
+        raws: Dict[str, Optional[bytes]] = {}
+        for doc_meta in published_docs:
+            doc_id = doc_meta["doc_id"]
+            previous_entry = previous.get(doc_id)
+            entry = self._manifest_entry(doc_id, previous_entry, raws)
+            if (
+                entry is not None
+                and previous_entry is not None
+                and previous_entry["hash"] == entry["hash"]
+                and previous_entry["metrics"] == entry["metrics"]
+                and os.path.exists(os.path.join(self._docs_dir_s, doc_id + ".html"))
+            ):
+                manifest[doc_id] = entry
+                raws.pop(doc_id, None)
+            else:
+                pending[doc_id] = entry
+        skipped_count = len(manifest)
+        doc_ids = list(pending)
+
+        if len(doc_ids) < _PARALLEL_MIN_DOCS:
+            # Not worth spinning up a process pool
+            results = (
+                _render_with(self, doc_id, timestamp, None, raws.get(doc_id)) for doc_id in doc_ids
+            )
+            executor = None
+        else:
+            # Workers only read metrics; the snapshot is passed per document
+            metrics = [self.metrics.get_metrics(doc_id) for doc_id in doc_ids]
+            # Cache files not already read for the manifest (stat unchanged) are read on
+            # threads up front, so workers only parse and render
+            unread = [doc_id for doc_id in doc_ids if doc_id not in raws]
+            raws.update(zip(unread, self._read_cache_blobs(unread)))
+            blobs = [raws.pop(doc_id) for doc_id in doc_ids]
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_pool_context())
+            results = executor.map(
+                _render_one, doc_ids, [timestamp] * len(doc_ids), metrics, blobs, chunksize=8
+            )
+
+        try:
+            for doc_id, error in results:
+                if error is None:
+                    success_count += 1
+                    if pending[doc_id] is not None:
+                        manifest[doc_id] = pending[doc_id]
+                else:
+                    logger.error(f"Failed to render {doc_id}: {error}")
+                    error_count += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self._save_manifest(manifest)
+        self.metrics.flush()
+        # One directory barrier for the whole batch rather than per page; page contents
+        # themselves are not fsynced (rerun with --full after a crash to rebuild them)
+        _fsync_dir(self.docs_dir, self._docs_dirfd)
+        _fsync_dir(self.public_dir)
+        logger.info(
+            f"Rendering complete: {success_count} success, {error_count} errors, "
+            f"{skipped_count} unchanged"
+        )
+
+    def _manifest_entry(
+        self,
+        doc_id: str,
+        previous: Optional[Dict[str, Any]] = None,
+        raws: Optional[Dict[str, Optional[bytes]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Fingerprint of everything a document page is rendered from
+
+        If the cache file has to be read for hashing, its bytes are stored in raws[doc_id].
+        """
+        cache_file = os.path.join(self._cache_dir_s, doc_id + ".json")
+        try:
+            st = os.stat(cache_file)
+            stat_key = [st.st_mtime_ns, st.st_size]
+            if previous is not None and previous.get("stat") == stat_key:
+                # Cache file untouched since the last build; reuse its hash unread
+                content_hash = previous["hash"]
+            else:
+                with open(cache_file, "rb") as f:
+                    data = f.read()
+                content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+                if raws is not None:
+                    raws[doc_id] = data
+        except OSError:
+            return None
+        metrics = self.metrics.get_metrics(doc_id)
+        return {
+            "hash": content_hash,
+            "stat": stat_key,
+            "metrics": [metrics.get("views", 0), metrics.get("downloads", 0), metrics.get("shares", 0)],
+        }
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the previous render manifest (empty if missing or from another template)"""
+        try:
+            manifest = _read_json(self.manifest_file)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("template") != _TEMPLATE_HASH:
+            return {}
+        return manifest.get("documents", {})
+
+    def _save_manifest(self, documents: Dict[str, Dict[str, Any]]):
+        """Persist the render manifest atomically (the caller fsyncs public_dir afterwards)"""
+        tmp_file = self.manifest_file.with_suffix(".json.tmp")
+        # Contents are synced before the rename, so a crash can't leave a truncated manifest
+        _write_bytes(
+            tmp_file,
+            _json_dumps({"template": _TEMPLATE_HASH, "documents": documents}),
+            fsync=True,
+        )
+        os.replace(tmp_file, self.manifest_file)
+
+    def _read_cache_blobs(self, doc_ids: List[str]) -> List[Optional[bytes]]:
+        """Read raw cache JSON for doc_ids concurrently (None where unreadable)"""
+
+        cache_dir = self._cache_dir_s
+
+        def read(doc_id: str) -> Optional[bytes]:
+            try:
+                with open(os.path.join(cache_dir, doc_id + ".json"), "rb") as f:
+                    return f.read()
+            except OSError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+            return list(pool.map(read, doc_ids))
+
+    def render_document(
+        self,
+        doc_id: str,
+        timestamp: Optional[str] = None,
+        metrics: Optional[Dict[str, int]] = None,
+        raw: Optional[bytes] = None,
+    ):
+        """Render a single document to HTML (raw: preloaded cache JSON bytes)"""
+        if raw is None:
+            cache_file = os.path.join(self._cache_dir_s, doc_id + ".json")
+            if not os.path.exists(cache_file):
+                raise FileNotFoundError(f"Cache file not found for {doc_id}")
+            content = _read_json(cache_file)
+        else:
+            content = _json_loads(raw)
+
+        title = content["title"]
+        properties = content.get("properties", {})
+        blocks = content.get("blocks", [])
+
+        barcode_html = self._barcode_html(doc_id)
+        content_html = self._render_blocks_to_html(blocks)
+        if metrics is None:
+            metrics = self.metrics.get_metrics(doc_id)
+        property_html = self._build_property_table(properties)
+
+        html = self._build_document_page(
+            doc_id=doc_id,
+            title=title,
+            barcode_html=barcode_html,
+            property_html=property_html,
+            content_html=content_html,
+            metrics=metrics,
+            timestamp=timestamp,
+        )
+
+        self._write_doc(doc_id, html.encode("utf-8"))
+
+        logger.info(f"Rendered: {doc_id} -> {os.path.join(self._docs_dir_s, doc_id + '.html')}")
+
+    def _write_doc(self, doc_id: str, data: bytes):
+        """Write a rendered document page relative to the open documents directory"""
+        name = doc_id + ".html"
+        if self._docs_dirfd is None:
+            _write_bytes(os.path.join(self._docs_dir_s, name), data)
+        else:
+            _write_bytes(name, data, dir_fd=self._docs_dirfd)
+
+    def _render_blocks_to_html(self, blocks: List[Dict]) -> str:
+        """Render list of blocks to HTML"""
+        out: List[str] = []
+        render_block = self._render_block_cached
+        list_tags = self._LIST_TAGS
+
+        # Group consecutive blocks into runs keyed by their (open, close) list tags,
+        # None for non-list blocks, so wrappers are emitted once per run
+        for tags, run in groupby(blocks, key=lambda block: list_tags.get(block.get("type"))):
+            if tags is None:
+                out.extend(map(render_block, run))
+            else:
+                out.append(tags[0])
+                out.extend(map(render_block, run))
+                out.append(tags[1])
+
+        return "".join(out)
+
+    def _build_property_table(self, properties: Dict[str, Any]) -> str:
+        """Build HTML table for document properties"""
+        if not properties:
+            return ""
+        items = tuple((key, type(value), value) for key, value in properties.items())
+        try:
+            return _property_table_html(items)
+        except TypeError:
+            # Unhashable property value; render without memoization
+            return _property_table_html.__wrapped__(items)
+
+    def _build_document_page(
+        self,
+        doc_id: str,
+        title: str,
+        barcode_html: str,
+        property_html: str,
+        content_html: str,
+        metrics: Dict[str, int],
+        timestamp: Optional[str] = None,
+    ) -> str:
+        """Build complete HTML document page (NO f-string; prevents KaTeX brace issues)"""
+
+        css = self._doc_css
+
+        return _fill_template(
+            _DOCUMENT_TEMPLATE_FMT,
+            {
+                "TITLE": _esc(title),
+                "CSS": str(css),
+                "DOC_ID": _esc(doc_id),
+                "BARCODE_HTML": str(barcode_html),
+                "PROPERTY_HTML": str(property_html),
+                "CONTENT_HTML": str(content_html),
+                "VIEWS": _itos(metrics.get("views", 0)),
+                "DOWNLOADS": _itos(metrics.get("downloads", 0)),
+                "SHARES": _itos(metrics.get("shares", 0)),
+                "TIMESTAMP": timestamp or _timestamp(),
+            },
+        )
+
+    def _get_document_css(self) -> str:
+        """Return CSS for document pages - Enhanced mobile-responsive design"""
+        return _DOCUMENT_CSS
+
+    def generate_homepage(self):
+        """Generate homepage with paginated document list"""
+        logger.info("Generating homepage...")
+
+        if self.published_docs is None:
+            logger.warning("No published documents for homepage")
+            self._create_empty_homepage()
+            return
+
+        # sorted() copy: the cached list is shared with the other stages
+        docs = sorted(self.published_docs, key=itemgetter("doc_id"), reverse=True)
+        # Read-only snapshot shared by every page; missing docs fall back to _ZERO
+        metrics_map = self.metrics.metrics
+
+        items_per_page = 10
+        total_pages = (len(docs) + items_per_page - 1) // items_per_page
+        timestamp = _timestamp()
+        pages: List[Tuple[Path, bytes]] = []
+
+        # Consume the sorted list page by page from one iterator
+        doc_iter = iter(docs)
+        for page_num in range(1, total_pages + 1):
+            page_docs = list(islice(doc_iter, items_per_page))
+
+            html = self._build_homepage_html(page_docs, page_num, total_pages, timestamp, metrics_map)
+
+            if page_num == 1:
+                output_file = self.public_dir / "index.html"
+            else:
+                output_file = self.public_dir / f"page-{page_num}.html"
+
+            pages.append((output_file, html.encode("utf-8")))
+
+        # Write all pages in one pass once rendering is done. Pages whose only change is
+        # the footer timestamp are not rewritten, so "Last updated" shows when that
+        # page's content last changed, not when the last build ran
+        volatile = timestamp.encode("utf-8")
+        for page_num, (output_file, data) in enumerate(pages, 1):
+            if _write_if_changed(output_file, data, volatile):
+                logger.info(f"Generated homepage page {page_num}/{total_pages}")
+            else:
+                logger.info(f"Homepage page {page_num}/{total_pages} unchanged")
+
+        self.metrics.flush()
+        _fsync_dir(self.public_dir)
+
+    def _create_empty_homepage(self):
+        """Create empty homepage when no documents published"""
+        html = self._build_homepage_html([], 1, 1)
+        _write_bytes(self.public_dir / "index.html", html.encode("utf-8"))
+
+    def _build_homepage_html(
+        self,
+        docs: List[Dict],
+        page_num: int,
+        total_pages: int,
+        timestamp: Optional[str] = None,
+        metrics_map: Optional[Dict[str, Dict[str, int]]] = None,
+    ) -> str:
+        """Build homepage HTML"""
+        if metrics_map is None:
+            metrics_map = self.metrics.metrics
+
+        get_metrics = metrics_map.get
+        rows = [_homepage_row(doc, get_metrics(doc["doc_id"], _ZERO)) for doc in docs]
+
+        table_html = "\n".join(rows) if rows else '<tr><td colspan="9" class="empty-state">No documents published</td></tr>'
+        pagination_html = self._build_pagination(page_num, total_pages)
+        css = self._home_css
+
+        # 替换占位符
+        return _fill_template(
+            _HOMEPAGE_TEMPLATE_FMT,
+            {
+                "CSS": css,
+                "DOC_COUNT": _itos(len(docs)),
+                "TABLE_HTML": table_html,
+                "PAGINATION_HTML": pagination_html,
+                "TIMESTAMP": timestamp or _timestamp(),
+            },
+        )
+
+
+
+    def _build_pagination(self, current_page: int, total_pages: int) -> str:
+        """Build pagination links"""
+        if total_pages <= 1:
+            return ""
+
+        links: List[str] = []
+
+        if current_page > 1:
+            prev_url = "index.html" if current_page == 2 else f"page-{current_page - 1}.html"
+            links.append(f'<a href="/{prev_url}" class="page-link">&larr; Previous</a>')
+
+        for i in range(1, total_pages + 1):
+            url = "index.html" if i == 1 else f"page-{i}.html"
+            if i == current_page:
+                links.append(f'<span class="page-link active">{i}</span>')
+            else:
+                links.append(f'<a href="/{url}" class="page-link">{i}</a>')
+
+        if current_page < total_pages:
+            next_url = f"page-{current_page + 1}.html"
+            links.append(f'<a href="/{next_url}" class="page-link">Next &rarr;</a>')
+
+        return f'<div class="pagination">{" ".join(links)}</div>'
+
+    def _get_homepage_css(self) -> str:
+        """Return CSS for homepage - Light theme with mobile support"""
+        return _HOMEPAGE_CSS
+
+    def generate_search_index(self):
+        """Generate search index JSON for client-side search"""
+        logger.info("Generating search index...")
+
+        docs = self.published_docs
+        if docs is None:
+            return
 
         search_index = []
         for doc in docs:
@@ -1660,8 +2111,13 @@ body {
                 }
             )
 
-        with open(self.public_dir / "search-index.json", "w", encoding="utf-8") as f:
-            json.dump(search_index, f, ensure_ascii=False, indent=2)
+        # Compact JSON for the client; the .gz sidecar is served via nginx gzip_static
+        # (mtime=0 keeps the archive byte-identical across unchanged builds)
+        data = _json_dumps(search_index)
+        _write_if_changed(self.public_dir / "search-index.json", data)
+        _write_if_changed(
+            self.public_dir / "search-index.json.gz", gzip.compress(data, compresslevel=6, mtime=0)
+        )
 
         logger.info(f"Search index generated with {len(search_index)} documents")
 
@@ -1669,28 +2125,76 @@ body {
         """Remove HTML files for documents no longer published"""
         logger.info("Cleaning up revoked documents...")
 
-        published_file = self.cache_dir / "published_documents.json"
-        if published_file.exists():
-            with open(published_file, "r", encoding="utf-8") as f:
-                published_docs = json.load(f)
+        published_docs = self.published_docs
+        if published_docs is not None:
             published_ids = {doc["doc_id"] for doc in published_docs}
         else:
             published_ids = set()
 
         removed_count = 0
-        for html_file in self.docs_dir.glob("DOC-*.html"):
-            doc_id = html_file.stem
-            if doc_id not in published_ids:
-                html_file.unlink()
-                logger.info(f"Removed revoked document: {doc_id}")
-                removed_count += 1
+        # Name checks only: scandir needs no per-entry stat for this
+        with os.scandir(self.docs_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not (name.startswith("DOC-") and name.endswith(".html")):
+                    continue
+                doc_id = name[:-5]
+                if doc_id not in published_ids:
+                    os.unlink(entry.path)
+                    logger.info(f"Removed revoked document: {doc_id}")
+                    removed_count += 1
 
         logger.info(f"Cleanup complete: {removed_count} files removed")
 
 
+# Below this many documents render_all_documents stays in-process
+_PARALLEL_MIN_DOCS = 8
+
+def _pool_context() -> Optional[multiprocessing.context.BaseContext]:
+    """Prefer fork so workers share the module-level templates and CSS copy-on-write"""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+# Per-worker renderer, created lazily inside each pool process
+_worker_renderer: Optional[HTMLRenderer] = None
+
+
+def _render_with(
+    renderer: HTMLRenderer,
+    doc_id: str,
+    timestamp: str,
+    metrics: Optional[Dict[str, int]],
+    raw: Optional[bytes] = None,
+) -> Tuple[str, Optional[str]]:
+    """Render one document, returning (doc_id, error message or None)"""
+    try:
+        renderer.render_document(doc_id, timestamp, metrics, raw)
+        return doc_id, None
+    except Exception as e:
+        return doc_id, str(e)
+
+
+def _render_one(
+    doc_id: str, timestamp: str, metrics: Dict[str, int], raw: Optional[bytes]
+) -> Tuple[str, Optional[str]]:
+    """Process-pool entry point for render_all_documents"""
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = HTMLRenderer(load_metrics=False)
+    return _render_with(_worker_renderer, doc_id, timestamp, metrics, raw)
+
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render the INTRA-HUB static site")
+    parser.add_argument("--full", action="store_true", help="re-render every document, ignoring the manifest")
+    args = parser.parse_args()
+
     renderer = HTMLRenderer()
-    renderer.render_all_documents()
+    renderer.render_all_documents(force=args.full)
     renderer.generate_homepage()
     renderer.generate_search_index()
     renderer.cleanup_revoked_documents()
@@ -7,8 +7,17 @@ Orchestrates the complete sync and render pipeline
 import os
 import sys
 import logging
+import tarfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+try:
+    import zstandard as zstd
+except ImportError:  # optional; tar_backup falls back to gzip
+    zstd = None
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -28,46 +37,116 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Backed-up directories under /opt/intra-hub-v1.0, and how many backups to keep
+BACKUP_DIRS = ['public', 'data', 'renderer', 'sync']
+KEEP_N = 30
+
+
 def create_backup():
     """Create full system backup before sync"""
     logger.info("Creating pre-sync backup...")
     
-    import subprocess
+    import shutil
     from datetime import datetime
     
-    backup_dir = Path('/opt/intra-hub-v1.0/backups')
+    base_dir = Path('/opt/intra-hub-v1.0')
+    backup_dir = base_dir / 'backups'
     backup_dir.mkdir(parents=True, exist_ok=True)
     
     timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
-    backup_file = backup_dir / f"intra-hub_fullbackup_{timestamp}.tgz"
     
     try:
-        # Backup critical directories
-        subprocess.run([
-            'tar', 'czf', str(backup_file),
-            '--exclude=*.pyc',
-            '--exclude=__pycache__',
-            '-C', '/opt/intra-hub-v1.0',
-            'public', 'data', 'renderer', 'sync'
-        ], check=True)
-        
-        logger.info(f"Backup created: {backup_file}")
-        
-        # Keep only last N backups
-        KEEP_N = 30
-        backups = sorted(backup_dir.glob('intra-hub_fullbackup_*.tgz'))
-        logger.info(f"Keeping latest {KEEP_N} backups (current: {len(backups)})")
-        if len(backups) > KEEP_N:
-            for old_backup in backups[:-KEEP_N]:
-                old_backup.unlink()
-                logger.info(f"Removed old backup: {old_backup}")
-                
+        if shutil.which('rsync'):
+            snapshot_backup(base_dir, backup_dir, timestamp)
+        else:
+            logger.info("rsync not found; falling back to a full tar backup")
+            tar_backup(base_dir, backup_dir, timestamp)
     except Exception as e:
         logger.warning(f"Backup failed (non-critical): {e}")
 
 
+def snapshot_backup(base_dir: Path, backup_dir: Path, timestamp: str):
+    """Incremental snapshot: unchanged files are hardlinked to the previous snapshot"""
+    import shutil
+    import subprocess
+    
+    snapshots = sorted(p for p in backup_dir.glob('snap-*') if not p.name.endswith('.partial'))
+    snapshot = backup_dir / f"snap-{timestamp}"
+    partial = backup_dir / f"snap-{timestamp}.partial"
+    
+    cmd = ['rsync', '-a', '--delete', '--exclude=*.pyc', '--exclude=__pycache__']
+    if snapshots:
+        cmd.append(f'--link-dest={snapshots[-1]}')
+    cmd += [str(base_dir / name) for name in BACKUP_DIRS]
+    cmd.append(str(partial) + '/')
+    subprocess.run(cmd, check=True)
+    
+    # Only complete snapshots are renamed into place (and used as --link-dest)
+    partial.rename(snapshot)
+    logger.info(f"Backup snapshot created: {snapshot}")
+    
+    snapshots.append(snapshot)
+    logger.info(f"Keeping latest {KEEP_N} snapshots (current: {len(snapshots)})")
+    for old_snapshot in snapshots[:-KEEP_N]:
+        shutil.rmtree(old_snapshot)
+        logger.info(f"Removed old snapshot: {old_snapshot}")
+    for stale in backup_dir.glob('snap-*.partial'):
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def _backup_filter(info: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+    """Leave bytecode out of tarball backups"""
+    name = os.path.basename(info.name)
+    if name == '__pycache__' or name.endswith('.pyc'):
+        return None
+    return info
+
+
+def tar_backup(base_dir: Path, backup_dir: Path, timestamp: str):
+    """Full tarball backup, written in-process (zstd when available, else gzip)"""
+    if zstd is not None:
+        backup_file = backup_dir / f"intra-hub_fullbackup_{timestamp}.tar.zst"
+    else:
+        backup_file = backup_dir / f"intra-hub_fullbackup_{timestamp}.tgz"
+    partial = backup_file.with_name(backup_file.name + '.partial')
+    
+    # Backup critical directories
+    if zstd is not None:
+        # Multi-threaded zstd; the tar stream is written straight into the compressor
+        cctx = zstd.ZstdCompressor(level=3, threads=-1)
+        with open(partial, 'wb') as raw, cctx.stream_writer(raw) as comp, \
+                tarfile.open(fileobj=comp, mode='w|') as tar:
+            for name in BACKUP_DIRS:
+                tar.add(base_dir / name, arcname=name, filter=_backup_filter)
+    else:
+        with tarfile.open(partial, mode='w:gz') as tar:
+            for name in BACKUP_DIRS:
+                tar.add(base_dir / name, arcname=name, filter=_backup_filter)
+    partial.rename(backup_file)
+    
+    logger.info(f"Backup created: {backup_file}")
+    
+    # Keep only last N backups (the timestamp orders names of either format)
+    backups = sorted(
+        [*backup_dir.glob('intra-hub_fullbackup_*.tgz'), *backup_dir.glob('intra-hub_fullbackup_*.tar.zst')]
+    )
+    logger.info(f"Keeping latest {KEEP_N} backups (current: {len(backups)})")
+    if len(backups) > KEEP_N:
+        for old_backup in backups[:-KEEP_N]:
+            old_backup.unlink()
+            logger.info(f"Removed old backup: {old_backup}")
+    for stale in backup_dir.glob('intra-hub_fullbackup_*.partial'):
+        stale.unlink()
+
+
 def main():
     """Main pipeline execution"""
+    parser = argparse.ArgumentParser(description='Run the INTRA-HUB sync and render pipeline')
+    parser.add_argument('--full', action='store_true',
+                        help='query every Notion page instead of only those edited since the last sync, '
+                             'and re-render every document')
+    args = parser.parse_args()
+    
     start_time = datetime.now()
     logger.info("=" * 60)
     logger.info("INTRA-HUB v1.0 - Daily Sync Pipeline Started")
@@ -95,23 +174,29 @@ def main():
         # Step 1: Sync from Notion
         logger.info("Step 1: Syncing from Notion...")
         syncer = NotionSync(token, database_id)
-        pages = syncer.fetch_all_pages()
+        pages = syncer.fetch_all_pages(full=args.full)
         result = syncer.process_pages(pages)
         syncer.fetch_and_cache_content(result['published_only'])
         
         # Step 2: Render HTML
         logger.info("Step 2: Rendering HTML pages...")
         renderer = HTMLRenderer()
-        renderer.render_all_documents()
-        renderer.generate_homepage()
-        
-        # Step 3: Generate search index
-        logger.info("Step 3: Generating search index...")
-        renderer.generate_search_index()
+        renderer.render_all_documents(force=args.full)
         
-        # Step 4: Cleanup revoked documents
-        logger.info("Step 4: Cleaning up revoked documents...")
-        renderer.cleanup_revoked_documents()
+        # Step 3: Homepage, search index and revoked-document cleanup. They only read the
+        # published list loaded by render_all_documents and write separate files, so run them together
+        logger.info("Step 3: Generating homepage and search index, cleaning up revoked documents...")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(step) for step in (
+                    renderer.generate_homepage,
+                    renderer.generate_search_index,
+                    renderer.cleanup_revoked_documents,
+                )
+            ]
+            # Re-raise the first failure so the pipeline still aborts on errors
+            for future in futures:
+                future.result()
         
         # Done
         end_time = datetime.now()
@@ -5,13 +5,27 @@ Pulls data from Notion database and manages document lifecycle
 """
 
 import os
+import re
 import sys
 import json
+import time
+import random
+import argparse
+import asyncio
+import hashlib
 import logging
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from notion_client import Client
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from notion_client import AsyncClient, Client
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used as a fallback
+    orjson = None
 
 # Setup logging
 logging.basicConfig(
@@ -25,11 +39,164 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _read_json(path: Path) -> Any:
+    """Load a JSON file (orjson when available)"""
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _json_bytes(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON (orjson when available)
+    
+    Compact by default; pretty=True indents by two spaces for files people read.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _atomic_write_bytes(path: Path, data: bytes, fsync: bool = False):
+    """Write data to a temporary sibling and rename it over path
+    
+    A crash mid-write leaves the previous file intact instead of a truncated one.
+    fsync=True also flushes the data to disk before the rename.
+    """
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _write_json(path: Path, obj: Any, pretty: bool = False, fsync: bool = False):
+    """Atomically write obj as UTF-8 JSON (see _json_bytes)"""
+    _atomic_write_bytes(path, _json_bytes(obj, pretty), fsync)
+
+
+# Notion reports last_edited_time rounded down to the minute; re-query a little overlap
+LAST_SYNC_OVERLAP = timedelta(minutes=2)
+
+def _parse_notion_time(value: str) -> datetime:
+    """Parse a Notion ISO 8601 timestamp ('2024-01-31T09:15:00.000Z')"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+# Incremental queries never return archived, deleted or moved pages, and don't revisit
+# pages whose DOC_ID write-back failed; run a full query at least this often
+FULL_SYNC_INTERVAL = timedelta(days=7)
+
+# Number part of an existing DOC-NNNNNN id
+_DOC_ID_RE = re.compile(r'^DOC-(\d+)$')
+
+# Properties stored as top-level document fields rather than under 'properties'
+CORE_PROPERTIES = frozenset(('TITLE', 'PUBLISH', 'DOC_ID'))
+
+# Retries for transient Notion failures (rate limiting, 5xx, timeouts)
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying a failed request, or None if it must not be retried"""
+    if attempt >= MAX_RETRIES:
+        return None
+    if isinstance(error, HTTPResponseError):
+        if error.status == 429:
+            # Rate limited: Notion says how long to back off
+            try:
+                return float(error.headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                pass
+        elif error.status < 500:
+            # Auth, validation, not found, ...: retrying won't help
+            return None
+    elif not isinstance(error, RequestTimeoutError):
+        return None
+    
+    delay = min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _with_retries(request: Callable[[], Any]) -> Any:
+    """Call request(), retrying transient Notion errors with exponential backoff"""
+    attempt = 0
+    while True:
+        try:
+            return request()
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise
+            logger.warning(f"Notion request failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+async def _with_retries_async(request: Callable[[], Awaitable[Any]]) -> Any:
+    """Async variant of _with_retries; the backoff doesn't block the event loop"""
+    attempt = 0
+    while True:
+        try:
+            return await request()
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise
+            logger.warning(f"Notion request failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+# Concurrent Notion requests while fetching content (API limit is ~3 requests/second)
+MAX_CONCURRENT_REQUESTS = 3
+
+
+def _join_field(items: Optional[List[Dict]], key: str, sep: str) -> Optional[str]:
+    """Join one field of a list property; None when the list is empty"""
+    if not items:
+        return None
+    return sep.join([item.get(key, '') for item in items])
+
+
+def _nested_field(value: Optional[Dict], key: str) -> Optional[str]:
+    """Read a field of an object property; None when the object is unset"""
+    if not value:
+        return None
+    return value.get(key)
+
+
+# Property type -> value extractor, used by NotionSync.extract_property_value
+_PROPERTY_HANDLERS = {
+    'title': lambda p: _join_field(p.get('title'), 'plain_text', ''),
+    'rich_text': lambda p: _join_field(p.get('rich_text'), 'plain_text', ''),
+    'select': lambda p: _nested_field(p.get('select'), 'name'),
+    'multi_select': lambda p: _join_field(p.get('multi_select'), 'name', ', '),
+    'checkbox': lambda p: p.get('checkbox', False),
+    'number': lambda p: p.get('number'),
+    'date': lambda p: _nested_field(p.get('date'), 'start'),
+    'people': lambda p: _join_field(p.get('people'), 'name', ', '),
+    'email': lambda p: p.get('email'),
+    'phone_number': lambda p: p.get('phone_number'),
+    'url': lambda p: p.get('url'),
+}
+
+
 class NotionSync:
     """Handles synchronization with Notion database"""
     
     def __init__(self, token: str, database_id: str):
+        self.token = token
         self.client = Client(auth=token)
+        # Caps concurrent DOC_ID write-backs across the update thread pool
+        self._write_sem = threading.Semaphore(MAX_CONCURRENT_REQUESTS)
         self.database_id = database_id
         self.data_dir = Path('/opt/intra-hub-v1.0/data')
         self.cache_dir = self.data_dir / 'cache'
@@ -39,30 +206,73 @@ class NotionSync:
         self.counter_file = self.data_dir / 'doc_counter.json'
         self.doc_mapping_file = self.data_dir / 'doc_mapping.json'
         
+        # page_id -> fingerprint of the content last cached for it, plus when it was fetched
+        self.fingerprints_file = self.data_dir / 'fingerprints.json'
+        self._fp = self.load_fingerprints()
+        # Incremental query state: start time of this run's query, and whether it was filtered
+        self.last_sync_file = self.data_dir / 'last_sync.json'
+        self._query_started = None
+        self._partial_query = False
+        self._last_full_sync = None
+        
+        # Timestamp stamped into files written by the current step (sampled once per step)
+        self._run_ts = datetime.now().isoformat()
+        
     def load_counter(self) -> int:
         """Load current document counter"""
         if self.counter_file.exists():
-            with open(self.counter_file, 'r') as f:
-                data = json.load(f)
-                return data.get('counter', 0)
+            data = _read_json(self.counter_file)
+            return data.get('counter', 0)
         return 0
     
     def save_counter(self, counter: int):
         """Save document counter"""
-        with open(self.counter_file, 'w') as f:
-            json.dump({'counter': counter, 'updated_at': datetime.now().isoformat()}, f)
+        _write_json(self.counter_file, {'counter': counter, 'updated_at': self._run_ts}, pretty=True, fsync=True)
     
     def load_doc_mapping(self) -> Dict[str, str]:
         """Load Notion page ID to DOC_ID mapping"""
         if self.doc_mapping_file.exists():
-            with open(self.doc_mapping_file, 'r') as f:
-                return json.load(f)
+            return _read_json(self.doc_mapping_file)
         return {}
     
     def save_doc_mapping(self, mapping: Dict[str, str]):
         """Save Notion page ID to DOC_ID mapping"""
-        with open(self.doc_mapping_file, 'w') as f:
-            json.dump(mapping, f, indent=2)
+        _write_json(self.doc_mapping_file, mapping, pretty=True, fsync=True)
+    
+    def load_fingerprints(self) -> Dict[str, Dict[str, str]]:
+        """Load page ID to content fingerprint mapping"""
+        if self.fingerprints_file.exists():
+            return _read_json(self.fingerprints_file)
+        return {}
+    
+    def save_fingerprints(self):
+        """Save page ID to content fingerprint mapping"""
+        _write_json(self.fingerprints_file, self._fp)
+    
+    def content_fingerprint(self, doc: Dict) -> Dict[str, str]:
+        """Fingerprint of everything a document's cache file is built from"""
+        meta = json.dumps(
+            [doc['doc_id'], doc['title'], doc.get('properties', {})],
+            sort_keys=True, ensure_ascii=False
+        )
+        return {
+            'last_edited_time': doc.get('last_edited_time'),
+            'meta': hashlib.blake2b(meta.encode('utf-8'), digest_size=16).hexdigest()
+        }
+    
+    def content_unchanged(self, page_id: str, fingerprint: Dict[str, str]) -> bool:
+        """Whether the content cached for page_id is known to match fingerprint"""
+        stored = self._fp.get(page_id)
+        if not stored or any(stored.get(key) != value for key, value in fingerprint.items()):
+            return False
+        # last_edited_time is rounded down to the minute, so an edit made after the fetch but
+        # in the same minute leaves it unchanged: only trust fetches from a later minute
+        edited = fingerprint['last_edited_time']
+        fetched_at = stored.get('fetched_at')
+        if not edited or not fetched_at:
+            return False
+        fetched_minute = datetime.fromisoformat(fetched_at).replace(second=0, microsecond=0)
+        return _parse_notion_time(edited) < fetched_minute
     
     def generate_doc_id(self, counter: int) -> str:
         """Generate document ID in format DOC-NNNNNN (6 digits)"""
@@ -70,53 +280,65 @@ class NotionSync:
     
     def extract_property_value(self, prop: Dict[str, Any]) -> Optional[str]:
         """Extract value from Notion property based on type"""
-        prop_type = prop.get('type')
-        
-        if prop_type == 'title':
-            if prop.get('title'):
-                return ''.join([t.get('plain_text', '') for t in prop['title']])
-        elif prop_type == 'rich_text':
-            if prop.get('rich_text'):
-                return ''.join([t.get('plain_text', '') for t in prop['rich_text']])
-        elif prop_type == 'select':
-            if prop.get('select'):
-                return prop['select'].get('name')
-        elif prop_type == 'multi_select':
-            if prop.get('multi_select'):
-                return ', '.join([t.get('name', '') for t in prop['multi_select']])
-        elif prop_type == 'checkbox':
-            return prop.get('checkbox', False)
-        elif prop_type == 'number':
-            return prop.get('number')
-        elif prop_type == 'date':
-            if prop.get('date'):
-                return prop['date'].get('start')
-        elif prop_type == 'people':
-            if prop.get('people'):
-                return ', '.join([p.get('name', '') for p in prop['people']])
-        elif prop_type == 'email':
-            return prop.get('email')
-        elif prop_type == 'phone_number':
-            return prop.get('phone_number')
-        elif prop_type == 'url':
-            return prop.get('url')
-        
-        return None
+        handler = _PROPERTY_HANDLERS.get(prop.get('type'))
+        return handler(prop) if handler else None
     
-    def fetch_all_pages(self) -> List[Dict]:
-        """Fetch all pages from Notion database"""
+    def load_last_sync(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Load the start times of the last successful sync and of the last full sync"""
+        if not self.last_sync_file.exists():
+            return None, None
+        state = _read_json(self.last_sync_file)
+        last_full = state.get('last_full_sync')
+        return (
+            datetime.fromisoformat(state['last_sync']),
+            datetime.fromisoformat(last_full) if last_full else None
+        )
+    
+    def save_last_sync(self, started: datetime, full: bool):
+        """Save the start time of a successful sync (and of the last full one)"""
+        last_full = started if full else self._last_full_sync
+        _write_json(self.last_sync_file, {
+            'last_sync': started.isoformat(),
+            'last_full_sync': last_full.isoformat() if last_full else None
+        }, pretty=True)
+    
+    def fetch_all_pages(self, full: bool = False) -> List[Dict]:
+        """Fetch pages from Notion database (only those edited since the last sync unless full)"""
         logger.info(f"Fetching pages from database {self.database_id}")
         
+        self._query_started = datetime.now(timezone.utc)
+        last_sync = None
+        if not full and (self.cache_dir / 'all_documents.json').exists():
+            last_sync, self._last_full_sync = self.load_last_sync()
+            if last_sync is not None and (
+                self._last_full_sync is None
+                or self._query_started - self._last_full_sync >= FULL_SYNC_INTERVAL
+            ):
+                # Periodic reconciliation: drops pages gone from the database, retries write-backs
+                logger.info(f"Last full sync older than {FULL_SYNC_INTERVAL.days} days; querying all pages")
+                last_sync = None
+        
+        query = {}
+        if last_sync is not None:
+            since = (last_sync - LAST_SYNC_OVERLAP).isoformat()
+            query['filter'] = {
+                'timestamp': 'last_edited_time',
+                'last_edited_time': {'on_or_after': since}
+            }
+            logger.info(f"Incremental sync: pages edited on or after {since}")
+        self._partial_query = last_sync is not None
+        
         all_pages = []
         has_more = True
         start_cursor = None
         
         while has_more:
             try:
-                response = self.client.databases.query(
+                response = _with_retries(lambda: self.client.databases.query(
                     database_id=self.database_id,
-                    start_cursor=start_cursor
-                )
+                    start_cursor=start_cursor,
+                    **query
+                ))
                 all_pages.extend(response.get('results', []))
                 has_more = response.get('has_more', False)
                 start_cursor = response.get('next_cursor')
@@ -129,44 +351,52 @@ class NotionSync:
     
     def update_notion_doc_id(self, page_id: str, doc_id: str):
         """Write DOC_ID back to Notion"""
+        # Built once per page and reused by every retry attempt
+        properties = {'DOC_ID': {'rich_text': [{'text': {'content': doc_id}}]}}
+        
+        def request():
+            with self._write_sem:
+                return self.client.pages.update(page_id=page_id, properties=properties)
+        
         try:
-            self.client.pages.update(
-                page_id=page_id,
-                properties={
-                    'DOC_ID': {
-                        'rich_text': [
-                            {
-                                'text': {
-                                    'content': doc_id
-                                }
-                            }
-                        ]
-                    }
-                }
-            )
+            _with_retries(request)
             logger.info(f"Updated Notion page {page_id} with DOC_ID: {doc_id}")
         except Exception as e:
             logger.error(f"Failed to update DOC_ID for page {page_id}: {e}")
     
+    def update_notion_doc_ids(self, updates: List[Tuple[str, str]]):
+        """Write several (page_id, doc_id) pairs back to Notion concurrently"""
+        if not updates:
+            return
+        logger.info(f"Writing {len(updates)} DOC_IDs back to Notion")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda update: self.update_notion_doc_id(*update), updates))
+    
     def process_pages(self, pages: List[Dict]) -> Dict[str, Any]:
         """Process pages and assign document numbers (6-digit format)"""
+        self._run_ts = datetime.now().isoformat()
         counter = self.load_counter()
         doc_mapping = self.load_doc_mapping()
         
         processed_docs = []
         published_docs = []
+        # DOC_ID write-backs, sent together after the loop
+        pending_updates = []
+        # Bound once: looked up as a local for every property of every page
+        extract = self.extract_property_value
         
         for page in pages:
             try:
                 page_id = page['id']
                 props = page.get('properties', {})
                 
-                # Extract core fields
-                title = self.extract_property_value(props.get('TITLE', {})) or 'Untitled'
-                publish = self.extract_property_value(props.get('PUBLISH', {})) or False
+                # Extract every property once; core fields are read from the result
+                extracted = {name: extract(prop) for name, prop in props.items()}
+                title = extracted.get('TITLE') or 'Untitled'
+                publish = extracted.get('PUBLISH') or False
                 
                 # Check if DOC_ID already exists in Notion
-                existing_doc_id = self.extract_property_value(props.get('DOC_ID', {}))
+                existing_doc_id = extracted.get('DOC_ID')
                 
                 # Assign DOC_ID if not present
                 if page_id not in doc_mapping and not existing_doc_id:
@@ -176,19 +406,17 @@ class NotionSync:
                     doc_mapping[page_id] = doc_id
                     
                     # Write back to Notion
-                    self.update_notion_doc_id(page_id, doc_id)
+                    pending_updates.append((page_id, doc_id))
                 elif existing_doc_id and page_id not in doc_mapping:
                     # Notion has DOC_ID but local mapping doesn't - sync from Notion
                     doc_mapping[page_id] = existing_doc_id
                     # Extract counter from DOC_ID (6 digits)
-                    try:
-                        doc_num = int(existing_doc_id.split('-')[1])
-                        counter = max(counter, doc_num)
-                    except:
-                        pass
+                    match = _DOC_ID_RE.match(str(existing_doc_id).strip())
+                    if match:
+                        counter = max(counter, int(match.group(1)))
                 elif page_id in doc_mapping and not existing_doc_id:
                     # Local has DOC_ID but Notion doesn't - write to Notion
-                    self.update_notion_doc_id(page_id, doc_mapping[page_id])
+                    pending_updates.append((page_id, doc_mapping[page_id]))
                 
                 doc_id = doc_mapping.get(page_id, 'UNASSIGNED')
                 
@@ -201,16 +429,13 @@ class NotionSync:
                     'created_time': page.get('created_time'),
                     'last_edited_time': page.get('last_edited_time'),
                     'url': page.get('url'),
-                    'properties': {}
+                    # All other properties, for homepage display
+                    'properties': {
+                        name: value for name, value in extracted.items()
+                        if name not in CORE_PROPERTIES and value is not None
+                    }
                 }
                 
-                # Extract all properties for homepage display
-                for prop_name, prop_value in props.items():
-                    if prop_name not in ['TITLE', 'PUBLISH', 'DOC_ID']:
-                        value = self.extract_property_value(prop_value)
-                        if value is not None:
-                            doc_data['properties'][prop_name] = value
-                
                 processed_docs.append(doc_data)
                 
                 if publish:
@@ -220,93 +445,184 @@ class NotionSync:
                 logger.error(f"Error processing page {page.get('id')}: {e}")
                 continue
         
+        self.update_notion_doc_ids(pending_updates)
+        
         # Save updated counter and mapping
         self.save_counter(counter)
         self.save_doc_mapping(doc_mapping)
         
+        if self._partial_query:
+            # Only edited pages were queried: merge them over the previous full set
+            processed_docs = self.merge_documents(processed_docs)
+            published_docs = [doc for doc in processed_docs if doc['publish']]
+        
         # Save processed data
         output = {
-            'sync_time': datetime.now().isoformat(),
+            'sync_time': self._run_ts,
             'total_documents': len(processed_docs),
             'published_documents': len(published_docs),
             'all_documents': processed_docs,
             'published_only': published_docs
         }
         
-        with open(self.cache_dir / 'all_documents.json', 'w') as f:
-            json.dump(processed_docs, f, indent=2, ensure_ascii=False)
+        _write_json(self.cache_dir / 'all_documents.json', processed_docs)
         
-        with open(self.cache_dir / 'published_documents.json', 'w') as f:
-            json.dump(published_docs, f, indent=2, ensure_ascii=False)
+        _write_json(self.cache_dir / 'published_documents.json', published_docs)
         
         logger.info(f"Processed {len(processed_docs)} documents, {len(published_docs)} published")
         
+        if self._query_started is not None:
+            self.save_last_sync(self._query_started, full=not self._partial_query)
+        
         return output
     
-    def fetch_page_blocks(self, page_id: str) -> List[Dict]:
+    def merge_documents(self, updated_docs: List[Dict]) -> List[Dict]:
+        """Overlay re-queried documents on the cached all_documents.json by page_id"""
+        merged = {doc['page_id']: doc for doc in _read_json(self.cache_dir / 'all_documents.json')}
+        for doc in updated_docs:
+            merged[doc['page_id']] = doc
+        return list(merged.values())
+    
+    async def fetch_page_blocks(
+        self, client: AsyncClient, sem: asyncio.Semaphore, page_id: str
+    ) -> List[Dict]:
         """Fetch all blocks (content) from a Notion page, including children"""
         blocks = []
+        # Breadth-first: every block with children on one level is listed concurrently
+        frontier = [(page_id, None)]
+        
+        while frontier:
+            levels = await asyncio.gather(
+                *(self._list_children(client, sem, block_id) for block_id, _ in frontier)
+            )
+            next_frontier = []
+            for (_, parent), children in zip(frontier, levels):
+                if parent is None:
+                    blocks = children
+                else:
+                    parent['children'] = children
+                next_frontier.extend(
+                    (block['id'], block) for block in children if block.get('has_children', False)
+                )
+            frontier = next_frontier
+        
+        return blocks
+    
+    async def _list_children(
+        self, client: AsyncClient, sem: asyncio.Semaphore, block_id: str
+    ) -> List[Dict]:
+        """List the direct children of one block, following pagination
+        
+        Errors that persist after retrying are raised, so a truncated tree is never cached.
+        """
+        children = []
         has_more = True
         start_cursor = None
         
-        while has_more:
-            try:
-                response = self.client.blocks.children.list(
-                    block_id=page_id,
+        async def request():
+            # Hold the semaphore for the request only, not while backing off
+            async with sem:
+                return await client.blocks.children.list(
+                    block_id=block_id,
                     start_cursor=start_cursor
                 )
-                fetched_blocks = response.get('results', [])
-                
-                # Recursively fetch children for blocks that have them
-                for block in fetched_blocks:
-                    if block.get('has_children', False):
-                        # Fetch child blocks recursively
-                        child_blocks = self.fetch_page_blocks(block['id'])
-                        block['children'] = child_blocks
-                    
-                blocks.extend(fetched_blocks)
-                has_more = response.get('has_more', False)
-                start_cursor = response.get('next_cursor')
-            except Exception as e:
-                logger.error(f"Error fetching blocks for page {page_id}: {e}")
-                break
         
-        return blocks
+        while has_more:
+            response = await _with_retries_async(request)
+            children.extend(response.get('results', []))
+            has_more = response.get('has_more', False)
+            start_cursor = response.get('next_cursor')
+        
+        return children
     
     def fetch_and_cache_content(self, published_docs: List[Dict]):
         """Fetch full content for all published documents"""
         logger.info(f"Fetching content for {len(published_docs)} published documents")
+        self._run_ts = datetime.now().isoformat()
+        asyncio.run(self._fetch_and_cache_all(published_docs))
+    
+    async def _fetch_and_cache_all(self, published_docs: List[Dict]):
+        """Fetch every document's block tree concurrently over one async client"""
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # One directory listing instead of a stat per document
+        with os.scandir(self.cache_dir) as entries:
+            cached = {entry.name for entry in entries if entry.name.endswith('.json')}
+        
+        async with AsyncClient(auth=self.token) as client:
+            fetched = await asyncio.gather(
+                *(self._fetch_and_cache_one(client, sem, doc, cached) for doc in published_docs)
+            )
+        
+        self.save_fingerprints()
+        logger.info(
+            f"Content fetched for {sum(fetched)} documents, "
+            f"{len(fetched) - sum(fetched)} unchanged or failed"
+        )
+    
+    async def _fetch_and_cache_one(
+        self, client: AsyncClient, sem: asyncio.Semaphore, doc: Dict, cached: Set[str]
+    ) -> bool:
+        """Fetch one document's blocks and write its cache file (False if skipped or failed)"""
+        page_id = doc['page_id']
+        doc_id = doc['doc_id']
+        cache_file = self.cache_dir / f"{doc_id}.json"
+        
+        # Unchanged in Notion since the last fetch and still cached: skip the block tree
+        fingerprint = self.content_fingerprint(doc)
+        if cache_file.name in cached and self.content_unchanged(page_id, fingerprint):
+            logger.debug(f"Unchanged since last sync: {doc_id}")
+            return False
         
-        for doc in published_docs:
-            page_id = doc['page_id']
-            doc_id = doc['doc_id']
+        try:
+            started = datetime.now(timezone.utc)
+            blocks = await self.fetch_page_blocks(client, sem, page_id)
             
-            try:
-                blocks = self.fetch_page_blocks(page_id)
-                
-                content_data = {
-                    'doc_id': doc_id,
-                    'page_id': page_id,
-                    'title': doc['title'],
-                    'properties': doc.get('properties', {}),
-                    'blocks': blocks,
-                    'fetched_at': datetime.now().isoformat()
-                }
-                
-                # Save to cache
-                cache_file = self.cache_dir / f"{doc_id}.json"
-                with open(cache_file, 'w') as f:
-                    json.dump(content_data, f, indent=2, ensure_ascii=False)
-                
-                logger.info(f"Cached content for {doc_id}: {len(blocks)} blocks")
-                
-            except Exception as e:
-                logger.error(f"Error fetching content for {doc_id}: {e}")
-                continue
-
+            content_data = {
+                'doc_id': doc_id,
+                'page_id': page_id,
+                'title': doc['title'],
+                'properties': doc.get('properties', {}),
+                'fetched_at': self._run_ts
+            }
+            
+            # Save to cache (off the event loop so other fetches keep going)
+            await asyncio.to_thread(self._write_cache_file, cache_file, content_data, blocks)
+            self._fp[page_id] = {**fingerprint, 'fetched_at': started.isoformat()}
+            
+            logger.info(f"Cached content for {doc_id}: {len(blocks)} blocks")
+            return True
+        
+        except Exception as e:
+            # Leave any previous cache file in place; the page is refetched next run
+            logger.error(f"Error fetching content for {doc_id}: {e}")
+            return False
+    
+    def _write_cache_file(self, cache_file: Path, content_data: Dict[str, Any], blocks: List[Dict]):
+        """Write one document's content cache as content_data plus a trailing 'blocks' list
+        
+        Blocks are serialized and written one top-level block at a time, so the encoded
+        document never has to be held in memory as a whole.
+        """
+        tmp = cache_file.with_name(cache_file.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            # Reopen the envelope object to append the blocks array
+            f.write(_json_bytes(content_data)[:-1])
+            f.write(b',"blocks":[' if content_data else b'"blocks":[')
+            for i, block in enumerate(blocks):
+                if i:
+                    f.write(b',')
+                f.write(_json_bytes(block))
+            f.write(b']}')
+        # Only replace the previous cache once the new one is complete
+        os.replace(tmp, cache_file)
 
 def main():
     """Main sync execution"""
+    parser = argparse.ArgumentParser(description='Sync documents from Notion')
+    parser.add_argument('--full', action='store_true',
+                        help='query every page instead of only those edited since the last sync')
+    args = parser.parse_args()
+    
     logger.info("=== INTRA-HUB Sync Started ===")
     
     # Load environment variables
@@ -324,7 +640,7 @@ def main():
         syncer = NotionSync(token, database_id)
         
         # Step 1: Fetch all pages
-        pages = syncer.fetch_all_pages()
+        pages = syncer.fetch_all_pages(full=args.full)
         
         # Step 2: Process and assign DOC_IDs (6-digit format)
         result = syncer.process_pages(pages)
@@ -1,20 +1,42 @@
-﻿import pathlib, re
+﻿import mmap, pathlib, re, sys
+
+# Objects are matched with [^{}]* rather than a lazy .*? under re.S, so a failed
+# attempt can't run on past the closing brace and backtrack across the whole file.
+_PAT = re.compile(rb"delimiters:\s*\[\s*\n\s*\{[^{}]*\}\s*,\s*\n\s*\{[^{}]*\}\s*\n\s*\]")
+# The same block once its braces have been escaped for str.format
+_PATCHED = re.compile(rb"delimiters:\s*\[\s*\n\s*\{\{[^{}]*\}\}\s*,\s*\n\s*\{\{[^{}]*\}\}\s*\n\s*\]")
 
 p = pathlib.Path("renderer/html_renderer.py")
-s = p.read_text(encoding="utf-8")
+# (mtime_ns, size) of the file the last time it was checked or patched
+stamp = p.with_name(".patch-stamp")
+
+
+def file_stamp():
+    st = p.stat()
+    return f"{st.st_mtime_ns} {st.st_size}"
+
+
+if stamp.exists() and stamp.read_text() == file_stamp():
+    print("Unchanged since last run.")
+    sys.exit(0)
 
-pattern = r"delimiters:\s*\[\s*\n\s*\{.*?\}\s*,\s*\n\s*\{.*?\}\s*\n\s*\]"
-m = re.search(pattern, s, flags=re.S)
-if not m:
-    raise SystemExit("ERROR: delimiters block not found")
+# Search the mapped bytes; the file is only copied if it has to be rewritten
+with p.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    if _PATCHED.search(mm):
+        s2 = None
+    else:
+        m = _PAT.search(mm)
+        if not m:
+            raise SystemExit("ERROR: delimiters block not found")
 
-block = m.group(0)
-block2 = block.replace("True", "true").replace("False", "false")
-block2 = block2.replace("{", "{{").replace("}", "}}")
+        block = m.group(0)
+        block2 = block.replace(b"True", b"true").replace(b"False", b"false")
+        block2 = block2.replace(b"{", b"{{").replace(b"}", b"}}")
+        s2 = mm[:m.start()] + block2 + mm[m.end():]
 
-s2 = s[:m.start()] + block2 + s[m.end():]
-if s2 == s:
+if s2 is None:
     print("No change needed.")
 else:
-    p.write_text(s2, encoding="utf-8")
+    p.write_bytes(s2)
     print("Patched:", p)
+stamp.write_text(file_stamp())